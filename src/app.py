@@ -229,7 +229,7 @@ class ApplicationManager:
                 self.log.info("尝试重新启动播放器")
                 self.player.stop_play()
                 time.sleep(1)
-                self.player.play(self.player.queue[0])
+                self.player.play(self.player.queue[0], 0)
         
         self.health_check.register_component(
             "player", 
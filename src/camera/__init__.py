@@ -6,8 +6,10 @@
 """
 
 from .camera_capture import AICameraController, VideoAnalyzer
+from .frame_ring import FrameRing
 
 __all__ = [
     'AICameraController',
-    'VideoAnalyzer'
+    'VideoAnalyzer',
+    'FrameRing'
 ]
\ No newline at end of file
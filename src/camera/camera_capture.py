@@ -17,6 +17,9 @@ from src.player.camera_controller import CameraController, CameraWidget, CameraT
 from src.ai.yolo_detector import YOLOv5Detector, DetectionResult
 from src.ai.people_counter import PeopleCounter, PeopleCountStats
 from src.ai.core_binding import CoreBindingManager, create_4core_optimized_config
+from src.utils.logger import get_logger
+
+log = get_logger("camera.capture")
 
 
 class VideoAnalyzer(QThread):
@@ -49,13 +52,13 @@ class VideoAnalyzer(QThread):
     def run(self):
         """线程运行函数"""
         try:
-            print("[AI分析器] 线程启动...")
+            log.info("[AI分析器] 线程启动...")
             
             # 绑定到AI核心
             self.core_binding_manager.bind_ai_inference_thread(self)
             
             # 初始化YOLOv5检测器
-            print(f"[AI分析器] 加载模型: {self.model_path}")
+            log.info(f"[AI分析器] 加载模型: {self.model_path}")
             self.detector = YOLOv5Detector(
                 model_path=self.model_path,
                 conf_threshold=0.6,  # 较高的置信度阈值确保准确性
@@ -63,7 +66,7 @@ class VideoAnalyzer(QThread):
             )
             
             self.running = True
-            print("[AI分析器] 分析器准备就绪，开始分析...")
+            log.info("[AI分析器] 分析器准备就绪，开始分析...")
             
             while self.running:
                 current_time = time.time()
@@ -102,15 +105,13 @@ class VideoAnalyzer(QThread):
                     self.total_analysis_time += analysis_time
                     self.last_analysis_time = current_time
                 else:
-                    print("[AI分析器] 接收到空帧或无效帧，跳过分析")
+                    log.debug("[AI分析器] 接收到空帧或无效帧，跳过分析")
                     
         except Exception as e:
-            print(f"[AI分析器] 视频分析线程错误: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"[AI分析器] 视频分析线程错误: {e}", exc_info=True)
         finally:
             self.running = False
-            print("[AI分析器] 线程停止")
+            log.info("[AI分析器] 线程停止")
     
     def _analyze_frame(self, frame: np.ndarray) -> Dict:
         """分析单帧图像"""
@@ -121,7 +122,7 @@ class VideoAnalyzer(QThread):
         
         # 每10帧打印一次检测结果，避免过于频繁
         if self.analysis_count % 10 == 0:
-            print(f"[AI分析器] 检测结果: {detection_result.person_count} 人")
+            log.debug(f"[AI分析器] 检测结果: {detection_result.person_count} 人")
             # print(f"[AI分析器] 检测框坐标: {detection_result.detections}")  # 注释详细坐标
         
         # 更新人数统计
@@ -138,7 +139,7 @@ class VideoAnalyzer(QThread):
         
         # 每30帧打印一次性能统计
         if self.analysis_count % 30 == 0:
-            print(f"[AI分析器] 性能统计: FPS={round(1000 / detector_stats['avg_inference_time_ms'], 2)}, 延迟={detector_stats['avg_inference_time_ms']}ms")
+            log.debug(f"[AI分析器] 性能统计: FPS={round(1000 / detector_stats['avg_inference_time_ms'], 2)}, 延迟={detector_stats['avg_inference_time_ms']}ms")
         
         return {
             'detection_result': detection_result,
@@ -218,12 +219,9 @@ class AICameraWidget(CameraWidget):
             pixmap_rect = self._get_pixmap_rect()
             rotation_angle = self.rotation_angle
             
-            # 获取当前QPixmap的实际尺寸
-            pixmap = self.pixmap()
-            if not pixmap:
+            # 没有画面时不绘制
+            if not self.has_frame():
                 return
-                
-            pixmap_size = pixmap.size()
             
             # 绘制检测框
             for detection in self.current_detections:
@@ -258,7 +256,7 @@ class AICameraWidget(CameraWidget):
                     painter.setPen(box_pen)
                     
         except Exception as e:
-            print(f"绘制检测框错误: {e}")
+            log.error(f"绘制检测框错误: {e}", exc_info=True)
     
     def _apply_rotation_to_detection(self, x1, y1, x2, y2, rotation_angle, pixmap_rect, scale_x, scale_y):
         """根据旋转角度调整检测框坐标"""
@@ -300,18 +298,7 @@ class AICameraWidget(CameraWidget):
     
     def _get_pixmap_rect(self) -> QtCore.QRect:
         """获取图像在控件中的显示区域"""
-        pixmap = self.pixmap()
-        if not pixmap:
-            return QtCore.QRect()
-        
-        pixmap_size = pixmap.size()
-        widget_size = self.size()
-        
-        # 计算居中显示的区域
-        x = (widget_size.width() - pixmap_size.width()) // 2
-        y = (widget_size.height() - pixmap_size.height()) // 2
-        
-        return QtCore.QRect(x, y, pixmap_size.width(), pixmap_size.height())
+        return self.display_rect()
 
 
 class AICameraController(CameraController):
@@ -332,18 +319,19 @@ class AICameraController(CameraController):
         self.on_analysis_result = None
     
     def initialize(self, camera_index: int = None, resolution: tuple = (640, 480), 
-                   fps: int = 30, enable_ai: bool = False, model_path: str = None):
+                   fps: int = 30, enable_ai: bool = False, model_path: str = None,
+                   fps_retrieve: Optional[float] = None, buffer_size: int = 1):
         """初始化摄像头控制器（扩展AI功能）"""
         # 保存当前AI状态
         ai_was_enabled = self.ai_enabled
         
         # 先禁用AI分析（如果正在运行）
         if self.ai_enabled:
-            print("[AI控制器] 重新初始化，先禁用AI分析...")
+            log.info("[AI控制器] 重新初始化，先禁用AI分析...")
             self.disable_ai_analysis()
         
         # 调用父类初始化
-        success = super().initialize(camera_index, resolution, fps)
+        success = super().initialize(camera_index, resolution, fps, fps_retrieve, buffer_size)
         
         if success and (enable_ai or ai_was_enabled):
             # 替换为AI增强的控件
@@ -353,7 +341,7 @@ class AICameraController(CameraController):
             ai_success = self.enable_ai_analysis(model_path)
             
             if not ai_success:
-                print("[AI控制器] ✗ AI分析初始化失败，但摄像头初始化成功")
+                log.warning("[AI控制器] ✗ AI分析初始化失败，但摄像头初始化成功")
                 # 即使AI失败，摄像头仍然可以工作
         
         return success
@@ -365,35 +353,35 @@ class AICameraController(CameraController):
                 # 使用默认模型路径
                 model_path = "models/yolov5s.onnx"
             
-            print("[AI控制器] 开始启用AI分析功能...")
+            log.info("[AI控制器] 开始启用AI分析功能...")
             
             # 确保先禁用已有的AI分析（防止重复初始化）
             if self.ai_enabled and self.video_analyzer:
-                print("[AI控制器] 检测到已有AI分析器，先禁用...")
+                log.info("[AI控制器] 检测到已有AI分析器，先禁用...")
                 self.disable_ai_analysis()
             
             # 检查摄像头是否已启动
             if not self.camera_thread or not self.camera_thread.isRunning():
-                print("[AI控制器] 摄像头未启动，先启动摄像头...")
+                log.info("[AI控制器] 摄像头未启动，先启动摄像头...")
                 if not self.start_camera():
-                    print("[AI控制器] ✗ 摄像头启动失败，无法启用AI分析")
+                    log.warning("[AI控制器] ✗ 摄像头启动失败，无法启用AI分析")
                     return False
             
             # 确保使用AI增强的控件
             if not isinstance(self.camera_widget, AICameraWidget):
-                print("[AI控制器] 替换为AI增强控件...")
+                log.debug("[AI控制器] 替换为AI增强控件...")
                 self.camera_widget = AICameraWidget()
             
             # 创建视频分析器
-            print("[AI控制器] 创建视频分析器...")
+            log.debug("[AI控制器] 创建视频分析器...")
             self.video_analyzer = VideoAnalyzer(model_path, self.core_binding_manager)
             
             # 连接信号
-            print("[AI控制器] 连接分析完成信号...")
+            log.debug("[AI控制器] 连接分析完成信号...")
             self.video_analyzer.analysis_complete.connect(self._on_analysis_complete)
             
             # 启动分析线程
-            print("[AI控制器] 启动分析线程...")
+            log.debug("[AI控制器] 启动分析线程...")
             self.video_analyzer.start()
             
             # 等待分析器启动完成
@@ -401,24 +389,24 @@ class AICameraController(CameraController):
             
             # 检查分析器是否成功启动
             if not self.video_analyzer.isRunning():
-                print("[AI控制器] ✗ AI分析器启动失败")
+                log.warning("[AI控制器] ✗ AI分析器启动失败")
                 self.video_analyzer = None
                 self.ai_enabled = False
                 return False
             
             # 最后设置帧回调，确保分析器已准备好接收帧
-            print("[AI控制器] 设置帧回调...")
+            log.debug("[AI控制器] 设置帧回调...")
             self.set_frame_callback(self._on_camera_frame_for_ai)
             
             self.ai_enabled = True
-            print("✓ AI分析功能已启用")
-            print("[AI控制器] AI分析器状态: 运行中={}".format(self.video_analyzer.isRunning()))
-            print("[AI控制器] 摄像头状态: 运行中={}".format(self.camera_thread.isRunning() if self.camera_thread else False))
+            log.info("✓ AI分析功能已启用")
+            log.info(f"[AI控制器] AI分析器状态: 运行中={self.video_analyzer.isRunning()}")
+            log.info(f"[AI控制器] 摄像头状态: 运行中={self.camera_thread.isRunning() if self.camera_thread else False}")
             
             return True
             
         except Exception as e:
-            print("✗ 启用AI分析失败: {}".format(e))
+            log.error(f"✗ 启用AI分析失败: {e}", exc_info=True)
             self.ai_enabled = False
             self.video_analyzer = None
             return False
@@ -432,7 +420,7 @@ class AICameraController(CameraController):
             
             # 停止并清理分析器
             if self.video_analyzer:
-                print("[AI控制器] 停止AI分析器...")
+                log.info("[AI控制器] 停止AI分析器...")
                 self.video_analyzer.stop_analysis()
                 
                 # 等待分析器完全停止
@@ -446,14 +434,14 @@ class AICameraController(CameraController):
                     pass  # 忽略断开连接错误
                 
                 self.video_analyzer = None
-                print("[AI控制器] AI分析器已停止")
+                log.info("[AI控制器] AI分析器已停止")
             
             self.ai_enabled = False
             self.analysis_results = {}
-            print("✓ AI分析功能已禁用")
+            log.info("✓ AI分析功能已禁用")
             
         except Exception as e:
-            print(f"✗ 禁用AI分析时出错: {e}")
+            log.error(f"✗ 禁用AI分析时出错: {e}", exc_info=True)
             self.ai_enabled = False
             self.video_analyzer = None
     
@@ -480,7 +468,7 @@ class AICameraController(CameraController):
                     current_time = time.time()
                     frame_interval = current_time - self._last_frame_time
                     if frame_interval > 1.0:  # 超过1秒没有帧更新
-                        print("[帧回调] 帧更新间隔: {:.2f}s (可能太慢)".format(frame_interval))
+                        log.debug(f"[帧回调] 帧更新间隔: {frame_interval:.2f}s (可能太慢)")
                     self._last_frame_time = current_time
             # else:
             #     print("[帧回调] 接收到无效帧，跳过")  # 注释频繁日志
@@ -500,7 +488,7 @@ class AICameraController(CameraController):
         if self.on_analysis_result:
             detection_result = analysis_result.get('detection_result')
             person_count = detection_result.person_count if detection_result else 0
-            print(f"[AI回调] 发送分析结果到主界面: {person_count}人")
+            log.debug(f"[AI回调] 发送分析结果到主界面: {person_count}人")
             self.on_analysis_result(analysis_result)
     
     def set_analysis_callback(self, callback: Callable):
@@ -0,0 +1,69 @@
+"""
+单生产者/单消费者帧环形缓冲区
+
+生产者只写 head，消费者只写 tail，热路径上不加锁；
+缓冲区满时覆盖最旧的帧，消费者落后时直接跳到仍有效的最旧帧。
+"""
+
+import threading
+from typing import Any, Optional
+
+
+class FrameRing:
+    """固定容量的 SPSC 帧环形缓冲区（满时丢弃最旧帧）"""
+
+    def __init__(self, capacity: int = 4):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity 必须是 2 的幂")
+        # 每个槽位存 (序号, 帧)，消费者据序号判断读到的槽位是否已被生产者套圈覆盖
+        self._buf = [(-1, None)] * capacity
+        self._mask = capacity - 1
+        self._capacity = capacity
+        self._head = 0  # 下一个写入位置（仅生产者修改）
+        self._tail = 0  # 下一个读取位置（仅消费者修改）
+        self._waiting = False  # 消费者是否已挂起等待（仅消费者修改）
+        self._ready = threading.Event()  # 唤醒挂起的消费者
+
+    def push(self, frame: Any) -> None:
+        """写入一帧（生产者线程），从不阻塞；只有消费者挂起时才触发 Event"""
+        head = self._head
+        self._buf[head & self._mask] = (head, frame)
+        self._head = head + 1
+        if self._waiting:
+            self._ready.set()
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """取出最旧的有效帧（消费者线程）；超时或被 wake() 唤醒时仍无新帧则返回 None"""
+        while True:
+            head = self._head
+            tail = self._tail
+            if head != tail:
+                if head - tail > self._capacity:
+                    # 被覆盖的帧已经丢失，跳到仍在缓冲区中的最旧帧
+                    tail = head - self._capacity
+                seq, frame = self._buf[tail & self._mask]
+                if seq != tail:
+                    # 读取期间该槽位被更新的帧覆盖，重新定位
+                    continue
+                self._tail = tail + 1
+                return frame
+            # 先登记挂起再清除标志并复查，避免错过这期间写入的帧
+            self._waiting = True
+            self._ready.clear()
+            try:
+                if self._head != tail:
+                    continue
+                if not self._ready.wait(timeout):
+                    return None
+                if self._head == tail:
+                    # 由 wake() 唤醒（或迟到的唤醒），没有新帧，交还调用方判断是否退出
+                    return None
+            finally:
+                self._waiting = False
+
+    def wake(self) -> None:
+        """唤醒消费者（用于退出）"""
+        self._ready.set()
+
+    def __len__(self) -> int:
+        return min(self._head - self._tail, self._capacity)
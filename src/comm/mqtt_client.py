@@ -31,6 +31,7 @@ class MqttClient:
         self._network_thread = None
         self._reconnect_thread = None
         self.on_connect_success: Optional[Callable] = None  # 连接成功回调
+        self.on_connection_changed: Optional[Callable[[bool], None]] = None  # 连接状态变化回调（网络线程中调用）
 
     def connect(self) -> None:
         """连接MQTT服务器，支持自动重连"""
@@ -150,7 +151,7 @@ class MqttClient:
         }
         
         if rc == 0:
-            self.connected = True
+            self._set_connected(True)
             self._reconnect_attempts = 0  # 重置重连计数
             self.log.info(f"MQTT连接成功 - {self.cfg.host}:{self.cfg.port}", "connect")
             
@@ -174,11 +175,22 @@ class MqttClient:
                     self.log.error("连接成功回调执行失败", "callback", e)
             
         else:
-            self.connected = False
+            self._set_connected(False)
             error_msg = rc_messages.get(rc, f"未知错误代码: {rc}")
             self.log.error(f"MQTT连接失败 - {error_msg} (rc={rc})", "connect")
             self._schedule_reconnect()
 
+    def _set_connected(self, connected: bool) -> None:
+        """更新连接状态，仅在状态变化时通知回调"""
+        if connected == self.connected:
+            return
+        self.connected = connected
+        if self.on_connection_changed:
+            try:
+                self.on_connection_changed(connected)
+            except Exception as e:
+                self.log.error("连接状态回调执行失败", "callback", e)
+
     def _on_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage):
         payload = msg.payload.decode("utf-8", errors="ignore")
         topic = msg.topic
@@ -198,7 +210,7 @@ class MqttClient:
         callback_thread.start()
 
     def _on_disconnect(self, client: mqtt.Client, userdata, rc):
-        self.connected = False
+        self._set_connected(False)
         if rc == 0:
             self.log.info("MQTT正常断开连接", "disconnect")
         else:
@@ -2,7 +2,7 @@ import json
 import time
 import threading
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
 from ..config.models import AppConfig
 from ..utils.logger import get_logger
@@ -55,6 +55,10 @@ class MqttService:
         except Exception as e:
             self.log.error(f"MQTT 连接失败: {e}，但应用将继续运行", "start")
 
+    def set_connection_callback(self, callback: Optional[Callable[[bool], None]]) -> None:
+        """设置连接状态变化回调，参数为是否已连接"""
+        self.client.on_connection_changed = callback
+
     def publish_status(self, status: Dict[str, Any]) -> None:
         topic = "ohos/status"
         status["ts"] = int(time.time() * 1000)
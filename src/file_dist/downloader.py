@@ -18,7 +18,7 @@ class Downloader:
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.log = get_logger("downloader")
 
-    async def fetch(self, url: str, dest: Path, checksum: Optional[str] = None, checksum_type: str = "md5", headers: Optional[dict] = None) -> DownloadResult:
+    async def fetch(self, url: str, dest: Path, checksum: Optional[str] = None, checksum_type: str = "md5", headers: Optional[dict] = None, expected_size: Optional[int] = None) -> DownloadResult:
         async with self.semaphore:
             tmp = dest.with_suffix(dest.suffix + ".part")
             try:
@@ -29,7 +29,9 @@ class Downloader:
                         with tmp.open("wb") as f:
                             async for chunk in resp.content.iter_chunked(1024 * 64):
                                 f.write(chunk)
-                if checksum and not verify_checksum(tmp, checksum, algo=checksum_type):
+                # 已知大小时先比较大小，不符则不再计算校验和；只有大小时也做大小校验
+                if (checksum or expected_size is not None) and not verify_checksum(
+                        tmp, checksum or "", algo=checksum_type, expected_size=expected_size):
                     self.log.error("Checksum mismatch for %s", url)
                     tmp.unlink(missing_ok=True)
                     return DownloadResult(tmp, False, "checksum_mismatch")
@@ -1,19 +1,21 @@
 import asyncio
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from ..config.models import DownloadConfig
 from ..utils.logger import get_logger
 from .downloader import Downloader, DownloadResult
 
 
 class DownloadTask:
-    def __init__(self, task_id: str, url: str, dest: Path, checksum: Optional[str], checksum_type: str, extract: bool):
+    def __init__(self, task_id: str, url: str, dest: Path, checksum: Optional[str], checksum_type: str, extract: bool,
+                 size: Optional[int] = None):
         self.task_id = task_id
         self.url = url
         self.dest = dest
         self.checksum = checksum
         self.checksum_type = checksum_type
         self.extract = extract
+        self.size = size  # 期望的文件字节数，未知时为 None
         self.status = "queued"
         self.reason: Optional[str] = None
 
@@ -24,14 +26,25 @@ class DownloadManager:
         self.downloader = Downloader(cfg.maxConcurrent)
         self.tasks: Dict[str, DownloadTask] = {}
         self.log = get_logger("download.manager")
+        self.on_tasks_changed: Optional[Callable[[], None]] = None  # 任务列表变化回调
+
+    def set_tasks_changed_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """设置任务列表变化回调"""
+        self.on_tasks_changed = callback
 
     def enqueue(self, task: DownloadTask) -> None:
         self.tasks[task.task_id] = task
+        if self.on_tasks_changed:
+            try:
+                self.on_tasks_changed()
+            except Exception as e:
+                self.log.warning(f"任务列表变化回调失败: {e}")
         asyncio.create_task(self._run(task))
 
     async def _run(self, task: DownloadTask) -> None:
         task.status = "downloading"
-        result: DownloadResult = await self.downloader.fetch(task.url, task.dest, task.checksum, task.checksum_type)
+        result: DownloadResult = await self.downloader.fetch(task.url, task.dest, task.checksum, task.checksum_type,
+                                                              expected_size=task.size)
         if result.success:
             task.status = "done"
         else:
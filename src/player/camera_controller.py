@@ -6,17 +6,24 @@ import time
 import json
 import base64
 from typing import Optional, Callable
+from ..utils.logger import get_logger
+
+log = get_logger("camera.controller")
 
 
 class CameraThread(QThread):
     """摄像头采集线程"""
     frame_ready = Signal(np.ndarray)
     
-    def __init__(self, camera_index: int = 0, resolution: tuple = (640, 480), fps: int = 30):
+    def __init__(self, camera_index: int = 0, resolution: tuple = (640, 480), fps: int = 30,
+                 retrieve_fps: Optional[float] = None, buffer_size: int = 1):
         super().__init__()
         self.camera_index = camera_index
+        self.buffer_size = buffer_size
         self.resolution = resolution
         self.fps = fps
+        # 解码频率：每轮都 grab() 保持缓冲区新鲜，只按此频率 retrieve() 解码
+        self.retrieve_fps = retrieve_fps or fps
         self.running = False
         self.cap = None
         
@@ -30,14 +37,14 @@ class CameraThread(QThread):
                 try:
                     self.cap = cv2.VideoCapture(self.camera_index, backend)
                     if self.cap.isOpened():
-                        print(f"使用后端 {backend} 成功打开摄像头 {self.camera_index}")
+                        log.info(f"使用后端 {backend} 成功打开摄像头 {self.camera_index}")
                         break
                 except Exception as e:
-                    print(f"后端 {backend} 打开摄像头失败: {e}")
+                    log.warning(f"后端 {backend} 打开摄像头失败: {e}")
                     continue
             
             if not self.cap or not self.cap.isOpened():
-                print(f"无法打开摄像头 {self.camera_index}")
+                log.warning(f"无法打开摄像头 {self.camera_index}")
                 return
             
             # 设置分辨率（尝试设置，但可能失败）
@@ -45,27 +52,35 @@ class CameraThread(QThread):
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
                 self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+                # 缩小驱动帧缓冲，避免读到数帧之前的旧画面（不支持的后端会忽略）
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
             except Exception as e:
-                print(f"设置摄像头参数失败: {e}")
+                log.warning(f"设置摄像头参数失败: {e}")
                 # 继续使用默认参数
             
             self.running = True
             
             # 计算帧间隔时间（毫秒）
             frame_interval = 1000 // self.fps if self.fps > 0 else 33
+            last_retrieve = 0.0
             
             while self.running:
                 start_time = time.time()
                 
-                ret, frame = self.cap.read()
-                if ret:
-                    # 转换为RGB格式用于显示
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    # print(f"[摄像头线程] 读取到新帧，尺寸: {frame_rgb.shape}，准备发送信号...")  # 注释频繁日志
-                    self.frame_ready.emit(frame_rgb)
-                    # print("[摄像头线程] 帧信号发送完成")  # 注释频繁日志
+                # 只抓取不解码；到了取帧时间才 retrieve()，其余帧不做解码
+                if not self.cap.grab():
+                    log.debug("[摄像头线程] 抓取帧失败")
                 else:
-                    print("[摄像头线程] 读取帧失败，ret=", ret)
+                    now = time.monotonic()
+                    if self.retrieve_fps > 0 and now - last_retrieve >= 1.0 / self.retrieve_fps:
+                        last_retrieve = now
+                        ret, frame = self.cap.retrieve()
+                        if ret:
+                            # 转换为RGB格式用于显示
+                            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                            self.frame_ready.emit(frame_rgb)
+                        else:
+                            log.debug(f"[摄像头线程] 解码帧失败，ret={ret}")
                 
                 # 控制帧率
                 elapsed = (time.time() - start_time) * 1000
@@ -73,7 +88,7 @@ class CameraThread(QThread):
                     self.msleep(int(frame_interval - elapsed))
                     
         except Exception as e:
-            print(f"摄像头线程错误: {e}")
+            log.error(f"摄像头线程错误: {e}", exc_info=True)
         finally:
             if self.cap:
                 self.cap.release()
@@ -101,65 +116,95 @@ class CameraWidget(QtWidgets.QLabel):
                 font-size: 14px;
             }
         """)
-        self.setText("摄像头未启动")
         self.current_frame = None
         self.rotation_angle = 0  # 当前旋转角度：0, 90, 180, 270
+        self._scale_key = None  # (源宽, 源高, 角度, 控件宽, 控件高)，变化时才重新计算目标尺寸
+        self._scaled_size = (0, 0)  # 未旋转画面缩放后的尺寸
+        self._frame_pixmap = None  # 未旋转的显示画面，绘制时再按角度旋转
+        self._display_rect = QtCore.QRect()  # 旋转后画面在控件中的显示区域
+        self.setText("摄像头未启动")
+    
+    def setText(self, text: str):
+        """显示文字时不再绘制画面"""
+        self._frame_pixmap = None
+        super().setText(text)
     
     def update_frame(self, frame: np.ndarray):
         """更新摄像头画面"""
         try:
-            # 应用旋转
-            rotated_frame = self._apply_rotation(frame)
-            
-            # 调整图像大小以适应控件
-            h, w = rotated_frame.shape[:2]
+            # 旋转不改动像素，只在绘制时变换坐标；这里按旋转后的宽高比计算显示尺寸
+            h, w = frame.shape[:2]
+            quarter = self.rotation_angle in (90, 270)
+            rotated_w, rotated_h = (h, w) if quarter else (w, h)
             target_size = self.size()
+            key = (w, h, self.rotation_angle, target_size.width(), target_size.height())
+            if key != self._scale_key:
+                # 保持宽高比缩放
+                aspect_ratio = rotated_w / rotated_h
+                if target_size.width() / target_size.height() > aspect_ratio:
+                    new_height = target_size.height()
+                    new_width = int(new_height * aspect_ratio)
+                else:
+                    new_width = target_size.width()
+                    new_height = int(new_width / aspect_ratio)
+                self._scale_key = key
+                self._scaled_size = (new_height, new_width) if quarter else (new_width, new_height)
+                self._display_rect = QtCore.QRect(
+                    (target_size.width() - new_width) // 2,
+                    (target_size.height() - new_height) // 2,
+                    new_width, new_height)
             
-            # 保持宽高比缩放
-            aspect_ratio = w / h
-            if target_size.width() / target_size.height() > aspect_ratio:
-                new_height = target_size.height()
-                new_width = int(new_height * aspect_ratio)
+            # 缩小到显示尺寸只做一次，绘制时不再需要缩放
+            if self._scaled_size == (w, h):
+                resized_frame = frame
             else:
-                new_width = target_size.width()
-                new_height = int(new_width / aspect_ratio)
-            
-            # 缩放图像
-            resized_frame = cv2.resize(rotated_frame, (new_width, new_height))
+                resized_frame = cv2.resize(frame, self._scaled_size, interpolation=cv2.INTER_AREA)
             
             # 转换为QPixmap
             h, w, c = resized_frame.shape
             bytes_per_line = 3 * w
             q_img = QtGui.QImage(resized_frame.data, w, h, bytes_per_line, QtGui.QImage.Format_RGB888)
-            pixmap = QtGui.QPixmap.fromImage(q_img)
             
-            self.setPixmap(pixmap)
-            self.current_frame = frame.copy()  # 保存原始帧
+            if self.text():
+                super().setText("")
+            self._frame_pixmap = QtGui.QPixmap.fromImage(q_img)
+            self.update()
+            # 保存原始分辨率帧供拍照使用；每帧都是采集线程新建的数组，无需再拷贝
+            self.current_frame = frame
             
         except Exception as e:
-            print(f"更新摄像头画面错误: {e}")
+            log.error(f"更新摄像头画面错误: {e}", exc_info=True)
     
-    def _apply_rotation(self, frame: np.ndarray) -> np.ndarray:
-        """应用旋转角度到图像"""
-        if self.rotation_angle == 0:
-            return frame
-        elif self.rotation_angle == 90:
-            return cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-        elif self.rotation_angle == 180:
-            return cv2.rotate(frame, cv2.ROTATE_180)
-        elif self.rotation_angle == 270:
-            return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        else:
-            return frame
+    def paintEvent(self, event):
+        """绘制边框后按旋转角度绘制画面，旋转由绘制变换完成，不拷贝像素"""
+        super().paintEvent(event)
+        pixmap = self._frame_pixmap
+        if pixmap is None:
+            return
+        rect = self._display_rect
+        painter = QtGui.QPainter(self)
+        painter.translate(rect.x() + rect.width() / 2, rect.y() + rect.height() / 2)
+        painter.rotate(self.rotation_angle)
+        painter.drawPixmap(QtCore.QPointF(-pixmap.width() / 2, -pixmap.height() / 2), pixmap)
+        painter.end()
+    
+    def has_frame(self) -> bool:
+        """当前是否正在显示画面"""
+        return self._frame_pixmap is not None
     
-    def rotate_frame(self, angle: int = 90):
-        """旋转摄像头画面"""
+    def display_rect(self) -> QtCore.QRect:
+        """旋转后画面在控件中的显示区域"""
+        return QtCore.QRect(self._display_rect) if self._frame_pixmap is not None else QtCore.QRect()
+    
+    def rotate_frame(self, angle: int = 90) -> int:
+        """旋转摄像头画面，返回旋转后的角度"""
         self.rotation_angle = (self.rotation_angle + angle) % 360
-        print(f"摄像头画面旋转至: {self.rotation_angle}度")
+        log.info(f"摄像头画面旋转至: {self.rotation_angle}度")
         
         # 如果当前有帧，重新显示
         if self.current_frame is not None:
             self.update_frame(self.current_frame)
+        return self.rotation_angle
     
     def get_rotation_angle(self) -> int:
         """获取当前旋转角度"""
@@ -188,29 +233,36 @@ class CameraWidget(QtWidgets.QLabel):
                 return img_base64
             
         except Exception as e:
-            print(f"编码图像错误: {e}")
+            log.error(f"编码图像错误: {e}", exc_info=True)
         
         return None
 
 
-class CameraController:
+class CameraController(QtCore.QObject):
     """摄像头控制器"""
+    frameReady = Signal(object)  # 新帧（在采集线程发射，接收方自行决定排队或直连）
     
     def __init__(self):
+        super().__init__()
         self.camera_thread = None
         self.camera_widget = None
         self.is_connected = False
         self.camera_index = 0
         self.resolution = (640, 480)
         self.fps = 30
+        self.fps_retrieve = None  # 解码频率，None 表示与采集帧率一致
+        self.buffer_size = 1  # 驱动帧缓冲大小
         self.on_frame_callback = None
         self.available_cameras = []
         self.rotation_angle = 0  # 旋转角度：0, 90, 180, 270
     
-    def initialize(self, camera_index: int = None, resolution: tuple = (640, 480), fps: int = 30):
+    def initialize(self, camera_index: int = None, resolution: tuple = (640, 480), fps: int = 30,
+                   fps_retrieve: Optional[float] = None, buffer_size: int = 1):
         """初始化摄像头控制器"""
         self.resolution = resolution
         self.fps = fps
+        self.fps_retrieve = fps_retrieve
+        self.buffer_size = buffer_size
         
         # 创建摄像头显示控件
         self.camera_widget = CameraWidget()
@@ -219,7 +271,7 @@ class CameraController:
         self.available_cameras = self._detect_available_cameras()
         
         if not self.available_cameras:
-            print("未找到可用摄像头设备，使用模拟模式")
+            log.info("未找到可用摄像头设备，使用模拟模式")
             self.camera_widget.setText("模拟模式: 无摄像头设备")
             # 在没有摄像头时返回True，让界面可以正常显示
             return True
@@ -231,8 +283,8 @@ class CameraController:
             # 使用第一个可用的摄像头
             self.camera_index = self.available_cameras[0]
         
-        print(f"可用摄像头设备: {self.available_cameras}")
-        print(f"使用摄像头索引: {self.camera_index}")
+        log.info(f"可用摄像头设备: {self.available_cameras}")
+        log.info(f"使用摄像头索引: {self.camera_index}")
         
         # 测试摄像头是否可用
         return self._test_camera()
@@ -246,16 +298,15 @@ class CameraController:
             try:
                 cap = cv2.VideoCapture(i)
                 if cap.isOpened():
-                    # 尝试读取一帧来验证摄像头是否真正可用
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
+                    # 抓取一帧来验证摄像头是否真正可用（只需确认有画面，不解码）
+                    if cap.grab():
                         available_cameras.append(i)
-                        print(f"检测到可用摄像头: {i}")
+                        log.info(f"检测到可用摄像头: {i}")
                     else:
-                        print(f"摄像头 {i} 无法读取画面")
+                        log.warning(f"摄像头 {i} 无法读取画面")
                 cap.release()
             except Exception as e:
-                print(f"检测摄像头 {i} 时出错: {e}")
+                log.error(f"检测摄像头 {i} 时出错: {e}", exc_info=True)
         
         return available_cameras
     
@@ -263,7 +314,7 @@ class CameraController:
         """测试摄像头是否可用"""
         try:
             if self.camera_index not in self.available_cameras:
-                print(f"摄像头索引 {self.camera_index} 不在可用设备列表中")
+                log.warning(f"摄像头索引 {self.camera_index} 不在可用设备列表中")
                 return False
             
             cap = cv2.VideoCapture(self.camera_index)
@@ -272,26 +323,25 @@ class CameraController:
                 cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
                 cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
                 
-                # 尝试读取几帧
+                # 尝试抓取几帧（只确认有画面，不解码）
                 success_count = 0
                 for _ in range(5):
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
+                    if cap.grab():
                         success_count += 1
                 
                 cap.release()
                 
                 if success_count > 0:
-                    print(f"摄像头 {self.camera_index} 测试通过")
+                    log.info(f"摄像头 {self.camera_index} 测试通过")
                     return True
                 else:
-                    print(f"摄像头 {self.camera_index} 无法读取画面")
+                    log.warning(f"摄像头 {self.camera_index} 无法读取画面")
                     return False
             else:
-                print(f"无法打开摄像头 {self.camera_index}")
+                log.warning(f"无法打开摄像头 {self.camera_index}")
                 return False
         except Exception as e:
-            print(f"测试摄像头错误: {e}")
+            log.error(f"测试摄像头错误: {e}", exc_info=True)
             return False
     
     def start_camera(self) -> bool:
@@ -301,7 +351,7 @@ class CameraController:
         
         # 检查是否有可用摄像头
         if not self.available_cameras:
-            print("无可用摄像头设备，启用模拟模式")
+            log.info("无可用摄像头设备，启用模拟模式")
             if self.camera_widget:
                 self.camera_widget.setText("模拟模式: 无摄像头设备")
                 self.camera_widget.setStyleSheet("""
@@ -322,11 +372,15 @@ class CameraController:
             self.camera_thread = CameraThread(
                 camera_index=self.camera_index,
                 resolution=self.resolution,
-                fps=self.fps
+                fps=self.fps,
+                retrieve_fps=self.fps_retrieve,
+                buffer_size=self.buffer_size
             )
             
             # 连接信号
             self.camera_thread.frame_ready.connect(self._on_frame_received)
+            # 直接在采集线程转发 frameReady，不经界面线程中转
+            self.camera_thread.frame_ready.connect(self.frameReady, QtCore.Qt.DirectConnection)
             
             # 启动线程
             self.camera_thread.start()
@@ -338,7 +392,7 @@ class CameraController:
             return True
             
         except Exception as e:
-            print(f"启动摄像头错误: {e}")
+            log.error(f"启动摄像头错误: {e}", exc_info=True)
             self.is_connected = False
             return False
     
@@ -366,7 +420,7 @@ class CameraController:
                 self.on_frame_callback(frame)
                 # print("[摄像头线程] 帧回调函数调用成功")  # 注释频繁日志
             except Exception as e:
-                print("[摄像头线程] 帧回调函数调用失败: {}".format(e))
+                log.warning(f"[摄像头线程] 帧回调函数调用失败: {e}")
         # else:
         #     print("[摄像头线程] 帧回调函数不存在，跳过")  # 注释频繁日志
     
@@ -384,6 +438,12 @@ class CameraController:
         """获取摄像头显示控件"""
         return self.camera_widget
     
+    def set_retrieve_fps(self, fps_retrieve: Optional[float]) -> None:
+        """调整解码频率（运行中立即生效），None 表示与采集帧率一致"""
+        self.fps_retrieve = fps_retrieve
+        if self.camera_thread:
+            self.camera_thread.retrieve_fps = fps_retrieve or self.camera_thread.fps
+    
     def set_frame_callback(self, callback: Callable):
         """设置帧回调函数"""
         self.on_frame_callback = callback
@@ -412,14 +472,15 @@ class CameraController:
                 cv2.imwrite(file_path, frame_bgr)
                 return True
         except Exception as e:
-            print(f"捕获图像错误: {e}")
+            log.error(f"捕获图像错误: {e}", exc_info=True)
         
         return False
     
-    def rotate_camera(self, angle: int = 90):
-        """旋转摄像头画面"""
+    def rotate_camera(self, angle: int = 90) -> int:
+        """旋转摄像头画面，返回旋转后的角度（无显示控件时为 0）"""
         if self.camera_widget:
-            self.camera_widget.rotate_frame(angle)
+            return self.camera_widget.rotate_frame(angle)
+        return 0
     
     def _apply_rotation_to_frame(self, frame: np.ndarray) -> np.ndarray:
         """应用旋转角度到图像"""
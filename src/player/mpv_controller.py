@@ -4,53 +4,235 @@ import subprocess
 import platform
 import queue
 import time
-import glob
+import stat
+import json
+import socket
+import itertools
+from array import array
+from collections import deque
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Iterator, Callable
 from ..utils.logger import get_logger
 
+# pyautogui 导入较慢，启动时加载一次；无图形环境下导入会抛出非 ImportError 异常
+try:
+    import pyautogui as _pyautogui
+except Exception:
+    _pyautogui = None
+
+
+# 运行平台在进程生命周期内不变，导入时确定一次
+_SYSTEM = platform.system().lower()
+_IS_WINDOWS = _SYSTEM == "windows"
+_IS_LINUX = _SYSTEM == "linux"
+
+# mpv 不使用父进程的标准输入输出；非 Windows 下放入独立会话，不受父进程信号影响
+_POPEN_KWARGS = {
+    "stdin": subprocess.DEVNULL,
+    "stdout": subprocess.DEVNULL,
+    "stderr": subprocess.DEVNULL,
+}
+if not _IS_WINDOWS:
+    _POPEN_KWARGS["start_new_session"] = True
+
+# Windows 下直接调用 FindFirstFileW/FindNextFileW 枚举目录
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.FindFirstFileW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+    _kernel32.FindFirstFileW.restype = wintypes.HANDLE
+    _kernel32.FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+    _kernel32.FindNextFileW.restype = wintypes.BOOL
+    _kernel32.FindClose.argtypes = [wintypes.HANDLE]
+    _kernel32.FindClose.restype = wintypes.BOOL
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+else:
+    _kernel32 = None
+
+_FILE_ATTRIBUTE_DIRECTORY = 0x10
+_FILE_ATTRIBUTE_DEVICE = 0x40
+_FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+def _fast_scan_windows(top: str, exts, min_size: int) -> List[Tuple[str, str, int]]:
+    """Windows 下枚举视频文件，文件大小直接取自 WIN32_FIND_DATAW，无需额外 stat
+
+    exts 为不带点的小写扩展名集合
+    """
+    results = []
+    data = wintypes.WIN32_FIND_DATAW()
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        handle = _kernel32.FindFirstFileW(os.path.join(directory, "*"), ctypes.byref(data))
+        if handle == _INVALID_HANDLE_VALUE:
+            continue  # 目录不可访问
+        try:
+            while True:
+                name = data.cFileName
+                attrs = data.dwFileAttributes
+                if attrs & _FILE_ATTRIBUTE_DIRECTORY:
+                    # 跳过 . / .. 及隐藏目录，不跟随目录链接
+                    if not name.startswith(".") and not attrs & _FILE_ATTRIBUTE_REPARSE_POINT:
+                        stack.append(os.path.join(directory, name))
+                elif not attrs & _FILE_ATTRIBUTE_DEVICE:
+                    lower_name = name.lower()
+                    if lower_name.rpartition(".")[2] in exts:
+                        size = (data.nFileSizeHigh << 32) | data.nFileSizeLow
+                        if size >= min_size:
+                            results.append((os.path.join(directory, name), lower_name, size))
+                if not _kernel32.FindNextFileW(handle, ctypes.byref(data)):
+                    break
+        finally:
+            _kernel32.FindClose(handle)
+    return results
+
+
+# 命令队列停止哨兵
+_SHUTDOWN = object()
+
+
+class _CommandQueue:
+    """有界命令队列：待执行的音量命令原地替换，播放命令只保留最新一条"""
+
+    def __init__(self, maxsize: int = 64):
+        self._items = deque()
+        self._maxsize = maxsize
+        self._unfinished = 0
+        self._cond = threading.Condition()
+
+    def put(self, item, timeout: Optional[float] = None) -> None:
+        """加入命令，队列满时等待，超时抛出 queue.Full（停止哨兵不受限制）"""
+        with self._cond:
+            if item is not _SHUTDOWN:
+                command = item[0]
+                if command == "_set_volume_internal":
+                    for i, pending in enumerate(self._items):
+                        if pending is not _SHUTDOWN and pending[0] == command:
+                            self._items[i] = item
+                            return
+                elif command == "_play_internal":
+                    kept = deque(p for p in self._items if p is _SHUTDOWN or p[0] != command)
+                    self._unfinished -= len(self._items) - len(kept)
+                    self._items = kept
+                if not self._cond.wait_for(lambda: len(self._items) < self._maxsize, timeout):
+                    raise queue.Full
+            self._items.append(item)
+            self._unfinished += 1
+            self._cond.notify_all()
+
+    def get_batch(self) -> list:
+        """阻塞直到有命令，然后一次取出全部待处理命令"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items)
+            items = list(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+            return items
+
+    def task_done(self, count: int = 1) -> None:
+        """标记若干条命令处理完成"""
+        with self._cond:
+            self._unfinished -= count
+            self._cond.notify_all()
+
+    def join(self) -> None:
+        """等待所有命令处理完成"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._unfinished <= 0)
+
 
 class MpvController:
+    # 小于该大小的视频文件视为损坏或未下载完成，扫描时跳过
+    MIN_VIDEO_SIZE = 1024
+    # 扫描时首批发布的文件数，以及之后每次发布的文件数
+    SCAN_BATCH_SIZE = 64
+    SCAN_FLUSH_SIZE = 1024
+    # 支持的视频格式（同时包含带点与不带点的扩展名，便于哈希查找）
+    _FORMATS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')
+    _SUPPORTED_FORMATS = frozenset(_FORMATS) | frozenset(ext[1:] for ext in _FORMATS)
+
     def __init__(self, video_path: str, volume: int = 70, loop: bool = True, show_controls: bool = True):
         self.log = get_logger("mpv")
         # 根据操作系统选择 mpv 可执行文件
-        system = platform.system().lower()
-        if system == "windows":
+        if _IS_WINDOWS:
             self.mpv_exe = r"D:\soft\mpv\mpv.exe"
-        elif system == "linux":
+        elif _IS_LINUX:
             self.mpv_exe = "mpv"  # Linux 系统使用系统路径中的 mpv
         else:
             self.mpv_exe = "mpv"  # 其他系统也使用 mpv
             
-        self.log.info(f"检测到系统: {system}, 使用 mpv 路径: {self.mpv_exe}")
-        self.queue: List[Path] = []
+        self.log.info(f"检测到系统: {_SYSTEM}, 使用 mpv 路径: {self.mpv_exe}")
+        self.queue: List[str] = []  # 视频文件路径（字符串，仅在边界处构造 Path）
+        self._index_of: Dict[str, int] = {}  # 文件 -> 队列索引
+        # 与 queue 平行的数组：小写文件名（排序键）与文件大小
+        self._lower_names: List[str] = []
+        self._sizes = array('Q')
+        self.playlist_version = 0  # 播放队列内容每次变化时递增，供界面判断是否需要刷新
+        self.on_queue_changed: Optional[Callable[[], None]] = None  # 播放队列变化回调
+        self.on_playback_changed: Optional[Callable[[], None]] = None  # 播放进程或当前文件变化回调
         self.loop = loop
         self.volume = volume
         self._lock = threading.Lock()
         self.current_process: Optional[subprocess.Popen] = None
         self.current_file_index = 0  # 当前播放文件的索引
-        self._last_process_check = 0  # 上次检查进程状态的时间戳
         
-        # 异步控制队列
-        self._command_queue = queue.Queue()
+        # 运行环境在进程生命周期内不变，只检测一次
+        self._is_kylin = os.path.exists('/etc/kylin-version')
+        self._in_container = os.path.exists('/.dockerenv') or os.path.exists('/.container')
+        self.is_headless = self._compute_headless()
+        if self.is_headless:
+            self.log.info("检测到无头模式，调整 MPV 参数")
+        
+        # 预先构建 mpv 命令前缀
+        # 路径在构造时转换为字符串，拼接命令行时不再反复 str()/as_posix()
+        self._subtitle_file = "/opt/mpvPlayer/data/sub.ass" if _IS_LINUX else "data/sub.ass"
+        self._base_cmd = self._build_base_command()
+        
+        # 常驻 mpv 的 IPC 地址（Windows 上继续按文件启动进程）
+        # 套接字路径带上本进程 PID，避免多个实例互相覆盖
+        self.ipc_path: Optional[str] = None if _IS_WINDOWS else f"/tmp/mpv-socket-{os.getpid()}"
+        self._ipc_process: Optional[subprocess.Popen] = None  # 以 --idle 模式启动的常驻进程
+        self._ipc_playlist_loaded = False  # 常驻进程中是否已加载播放列表（由 mpv 自行切换）
+        self._ipc_sock: Optional[socket.socket] = None  # 常驻 IPC 连接（读线程负责接收）
+        self._ipc_write_lock = threading.Lock()
+        self._ipc_request_ids = itertools.count(1)
+        self._ipc_pending: Dict[int, threading.Event] = {}  # request_id -> 等待事件
+        self._ipc_responses: Dict[int, dict] = {}
+        
+        # UI 就绪后再开始播放（由界面显示后调用 ui_ready）
+        self._ui_ready = threading.Event()
+        
+        # 异步控制队列；只允许执行下表中的命令
+        self._cmd_table = {name: getattr(self, name) for name in (
+            "_play_internal",
+            "_toggle_pause_internal",
+            "_set_volume_internal",
+            "_next_file_internal",
+            "_stop_play_internal",
+            "_auto_play_next",
+            "_install_sorted_playlist",
+        )}
+        self._command_queue = _CommandQueue()
         self._running = True
         self._worker_thread = threading.Thread(target=self._command_worker, daemon=True)
         self._worker_thread.start()
         
-        # 播放状态监测线程
-        self._monitor_thread = threading.Thread(target=self._monitor_playback, daemon=True)
-        self._monitor_thread.start()
-        
-        # 延迟初始化播放列表
-        threading.Thread(target=self._init_playlist, args=(video_path,), daemon=True).start()
-        
         # 播放列表文件路径
-        self.playlist_file = None
+        self.playlist_file: Optional[str] = None
         self.use_playlist_mode = False  # 是否使用播放列表模式
+        # 扫描期间按单文件模式启动、扫描结束后要切换到播放列表模式时为 True；
+        # 此时按文件启动的进程不单曲循环，当前文件自然结束后再以播放列表模式启动
+        self._playlist_pending = False
         
         # 支持的视频格式
-        self.supported_formats = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
+        self.supported_formats = self._SUPPORTED_FORMATS
         
+        # 延迟初始化播放列表（所有属性就绪后再启动，避免与后台线程竞争）
+        threading.Thread(target=self._init_playlist, args=(video_path,), daemon=True).start()
 
 
     def _init_playlist(self, video_path: str) -> None:
@@ -60,64 +242,73 @@ class MpvController:
         self.set_playlist_dir(video_path, use_playlist_mode)
 
     def _command_worker(self) -> None:
-        """命令处理工作线程"""
-        while self._running:
+        """命令处理工作线程：每次取出全部待处理命令，合并后依次执行"""
+        running = True
+        while running:
+            batch = self._command_queue.get_batch()
+            taken = len(batch)
             try:
-                command, args, kwargs = self._command_queue.get(timeout=1)
-                try:
-                    if hasattr(self, command):
-                        getattr(self, command)(*args, **kwargs)
-                    else:
-                        self.log.error("未知命令: %s", command)
-                except Exception as e:
-                    self.log.error(f"执行命令 {command} 时出错: {e}")
-                finally:
-                    self._command_queue.task_done()
-            except queue.Empty:
-                continue
+                for i, item in enumerate(batch):
+                    if item is _SHUTDOWN:
+                        # 停止前执行哨兵之前的命令
+                        batch = batch[:i]
+                        running = False
+                        break
+                
+                for command, args, kwargs in self._fold_commands(batch):
+                    try:
+                        handler = self._cmd_table.get(command)
+                        if handler is not None:
+                            handler(*args, **kwargs)
+                        else:
+                            self.log.error(f"未知命令: {command}")
+                    except Exception as e:
+                        self.log.error(f"执行命令 {command} 时出错: {e}")
             except Exception as e:
                 self.log.error(f"命令工作线程异常: {e}")
-                time.sleep(0.1)
+            finally:
+                self._command_queue.task_done(taken)
     
-    def _monitor_playback(self) -> None:
-        """播放状态监测线程"""
-        while self._running:
-            try:
-                current_time = time.time()
-                # 每2秒检查一次播放进程状态
-                if current_time - self._last_process_check > 2:
-                    self._last_process_check = current_time
-                    self._check_playback_status()
-                time.sleep(1)
-            except Exception as e:
-                self.log.error(f"播放状态监测异常: {e}")
-                time.sleep(2)
+    @staticmethod
+    def _fold_commands(batch: list) -> list:
+        """合并一批命令：音量只保留最后一次，暂停/播放按次数奇偶抵消，连续的自动下一首只执行一次"""
+        last_volume = -1
+        pauses = []
+        for i, (command, _, _) in enumerate(batch):
+            if command == "_set_volume_internal":
+                last_volume = i
+            elif command == "_toggle_pause_internal":
+                pauses.append(i)
+        keep_pause = pauses[-1] if len(pauses) % 2 else -1
+        
+        folded = []
+        for i, item in enumerate(batch):
+            command = item[0]
+            if command == "_set_volume_internal" and i != last_volume:
+                continue
+            if command == "_toggle_pause_internal" and i != keep_pause:
+                continue
+            if command == "_auto_play_next" and folded and folded[-1][0] == command:
+                continue
+            folded.append(item)
+        return folded
     
-    def _check_playback_status(self) -> None:
-        """检查播放状态，如果播放完成则自动播放下一个文件"""
-        if not self.current_process:
-            return
-            
-        # 检查进程是否仍在运行
-        poll_result = self.current_process.poll()
-        if poll_result is not None:
-            # 进程已结束，检查退出码
-            self.log.info(f"MPV进程已结束，退出码: {poll_result}")
-            self.current_process = None
-            
-            # 自动播放下一个文件
-            if self.queue:
-                self.log.info("检测到播放完成，自动播放下一个文件")
-                self._queue_command("_auto_play_next")
+    def _on_process_exit(self, process: subprocess.Popen) -> None:
+        """等待MPV进程退出（每个进程一个等待线程），播放完成后自动播放下一个文件"""
+        exit_code = process.wait()
+        
+        # 被主动停止或替换的进程不触发自动切换
+        if process is not self.current_process or not self._running:
             return
-            
-        # 如果进程还在运行，尝试通过IPC检测播放状态
-        try:
-            # 这里可以添加IPC检测逻辑，但目前先保持简单
-            # 后续可以优化为通过IPC检测播放状态
-            pass
-        except Exception as e:
-            self.log.debug(f"IPC状态检测失败: {e}")
+        
+        self.log.info(f"MPV进程已结束，退出码: {exit_code}")
+        self.current_process = None
+        self._notify_playback_changed()
+        
+        # 自动播放下一个文件
+        if self.queue:
+            self.log.info("检测到播放完成，自动播放下一个文件")
+            self._queue_command("_auto_play_next")
 
     def _queue_command(self, command: str, *args, **kwargs) -> None:
         """将命令加入队列"""
@@ -135,64 +326,199 @@ class MpvController:
         """
         def _set_playlist_internal():
             dir_path = Path(path)
-            if dir_path.is_dir():
-                # 搜索所有支持的视频文件
-                video_files = self._find_video_files(dir_path)
-                
-                # 按文件名排序
-                video_files.sort()
-                
-                with self._lock:
-                    self.queue = video_files
-                    self.use_playlist_mode = use_playlist_mode
-                
-                if self.queue:
-                    self.log.info(f"在 {path} 目录下找到 {len(self.queue)} 个视频文件")
-                    for i, file_path in enumerate(self.queue[:5]):  # 只显示前5个文件
-                        self.log.info(f"  {i+1}. {file_path.name}")
-                    if len(self.queue) > 5:
-                        self.log.info(f"  ... 还有 {len(self.queue) - 5} 个文件")
-                    
-                    # 如果使用播放列表模式，创建播放列表文件
-                    if use_playlist_mode:
-                        self._create_playlist_file()
-                    
-                    # 延迟启动播放器
-                    time.sleep(1)  # 等待 1 秒让 UI 完全加载
-                    self._queue_command("_play_internal", self.queue[0])
-                else:
-                    self.log.warning("在目录 %s 中未找到视频文件", path)
-                    self.log.warning("支持的格式: %s", ", ".join(self.supported_formats))
-            else:
+            if not dir_path.is_dir():
                 self.log.error("目录不存在: %s", path)
+                return
+            
+            # 扫描完成前按单文件模式播放，播放列表文件在扫描结束后生成
+            with self._lock:
+                self.queue = []
+                self._lower_names = []
+                self._sizes = array('Q')
+                self._index_of = {}
+                self.use_playlist_mode = False
+                self._playlist_pending = use_playlist_mode
+                self.playlist_version += 1
+            self._notify_queue_changed()
+            
+            # 扫描结果先收集在本地列表，分块发布到播放队列；第一批就绪后立即开始播放
+            found: List[Tuple[str, str, int]] = []
+            published = 0
+            flush_size = self.SCAN_BATCH_SIZE
+            started = False
+            for entry in self._iter_video_files(dir_path):
+                found.append(entry)
+                if len(found) - published < flush_size:
+                    continue
+                self._append_scanned(found[published:])
+                published = len(found)
+                if not started:
+                    started = True
+                    flush_size = self.SCAN_FLUSH_SIZE  # 之后按更大的块发布，减少加锁次数
+                    self._start_first_file()
+            
+            if not found:
+                self.log.warning("在目录 %s 中未找到视频文件", path)
+                self.log.warning("支持的格式: %s", ", ".join(self._FORMATS))
+                return
+            
+            # 在锁外对本地快照整体排序，再由工作线程一次性替换
+            found.sort(key=itemgetter(1))
+            if not started:
+                # 文件较少时扫描已经结束，排序完成后再开始播放
+                self._ui_ready.wait(timeout=1.0)
+            self._queue_command("_install_sorted_playlist", path, use_playlist_mode, not started, found)
         
         threading.Thread(target=_set_playlist_internal, daemon=True).start()
     
-    def _find_video_files(self, dir_path: Path) -> List[Path]:
-        """搜索视频文件"""
-        video_files = []
-        
-        # 递归搜索所有支持的视频文件
-        for root, dirs, files in os.walk(dir_path):
-            for file in files:
-                file_ext = Path(file).suffix.lower()
-                if file_ext in self.supported_formats:
-                    video_files.append(Path(root) / file)
-        
-        return video_files
+    def _append_scanned(self, batch: List[Tuple[str, str, int]]) -> None:
+        """将一批扫描结果追加到播放队列（批内按文件名排序，一次加锁）"""
+        batch.sort(key=itemgetter(1))
+        paths = [e[0] for e in batch]
+        lower_names = [e[1] for e in batch]
+        sizes = [e[2] for e in batch]
+        with self._lock:
+            start = len(self.queue)
+            self.queue.extend(paths)
+            self._lower_names.extend(lower_names)
+            self._sizes.extend(sizes)
+            self._index_of.update(zip(paths, range(start, start + len(paths))))
+            self.playlist_version += 1
+        self._notify_queue_changed()
+    
+    def _notify_queue_changed(self) -> None:
+        """通知界面播放队列已变化（在调用线程中执行，回调需自行切换到界面线程）"""
+        if self.on_queue_changed:
+            try:
+                self.on_queue_changed()
+            except Exception as e:
+                self.log.warning(f"播放队列变化回调失败: {e}")
+    
+    def set_queue_changed_callback(self, callback: Callable[[], None]) -> None:
+        """设置播放队列变化回调"""
+        self.on_queue_changed = callback
+    
+    def _notify_playback_changed(self) -> None:
+        """通知界面播放进程或当前文件已变化（在调用线程中执行）"""
+        if self.on_playback_changed:
+            try:
+                self.on_playback_changed()
+            except Exception as e:
+                self.log.warning(f"播放状态变化回调失败: {e}")
+    
+    def set_playback_changed_callback(self, callback: Callable[[], None]) -> None:
+        """设置播放状态变化回调"""
+        self.on_playback_changed = callback
+    
+    def _start_first_file(self) -> None:
+        """等待 UI 就绪后播放第一个已发现的文件（最多等待 1 秒）"""
+        self._ui_ready.wait(timeout=1.0)
+        self._queue_command("_play_internal", self.queue[0], 0)
+    
+    def _install_sorted_playlist(self, path: str, use_playlist_mode: bool, start_playback: bool,
+                                 entries: List[Tuple[str, str, int]]) -> None:
+        """扫描结束后替换为已排序的完整播放队列（在命令工作线程中执行，与播放命令串行）"""
+        queue_paths = [e[0] for e in entries]
+        lower_names = [e[1] for e in entries]
+        sizes = array('Q', [e[2] for e in entries])
+        index_of = {p: i for i, p in enumerate(queue_paths)}
+        with self._lock:
+            current = self.queue[self.current_file_index] if 0 <= self.current_file_index < len(self.queue) else None
+            self.queue = queue_paths
+            self._lower_names = lower_names
+            self._sizes = sizes
+            self._index_of = index_of
+            self.playlist_version += 1
+            # 按新顺序找回正在播放的文件；它已不在新列表中（扫描期间被删除等）时，
+            # 置为 -1，使下一首从列表第一个文件开始
+            if current is not None and not start_playback:
+                index = self._index_of.get(current)
+                if index is None:
+                    self.log.warning(f"正在播放的文件不在新播放列表中: {os.path.basename(current)}")
+                    index = -1
+                self.current_file_index = index
+            self.use_playlist_mode = use_playlist_mode
+            self._playlist_pending = False
+        self._notify_queue_changed()
+        
+        total_mb = sum(self._sizes) / (1024 * 1024)
+        self.log.info(f"在 {path} 目录下找到 {len(self.queue)} 个视频文件，共 {total_mb:.1f} MB")
+        for i, file_path in enumerate(self.queue[:5]):  # 只显示前5个文件
+            self.log.info(f"  {i+1}. {os.path.basename(file_path)}")
+        if len(self.queue) > 5:
+            self.log.info(f"  ... 还有 {len(self.queue) - 5} 个文件")
+        
+        # 如果使用播放列表模式，创建播放列表文件
+        if use_playlist_mode:
+            self._create_playlist_file()
+        
+        if start_playback:
+            self._play_internal(self.queue[0], 0)
+        elif self.use_playlist_mode and self.current_process:
+            self._switch_to_playlist_mode()
+    
+    def _switch_to_playlist_mode(self) -> None:
+        """扫描期间以单文件模式开始的播放切换为播放列表模式"""
+        # 常驻进程：取消单曲循环，当前文件结束后自动加载播放列表
+        if self._send_mpv_ipc_command(["set_property", "loop-file", "no"]):
+            self.log.info("播放列表已就绪，当前文件结束后切换到播放列表模式")
+            return
+        # 按文件启动的进程无法在运行中修改；它启动时未设单曲循环，
+        # 当前文件播放结束后由 _auto_play_next 以播放列表模式启动下一个文件，不中断当前播放
+        self.log.info("播放列表已就绪，当前文件结束后切换到播放列表模式")
+    
+    def _iter_video_files(self, dir_path: Path) -> Iterator[Tuple[str, str, int]]:
+        """逐个产出视频文件（跳过空文件、过小文件及非普通文件）：(路径, 小写文件名, 大小)"""
+        # 类级扩展名集合（含不带点的形式），配合 rpartition 做哈希查找
+        exts = MpvController._SUPPORTED_FORMATS
+        
+        if _kernel32 is not None:
+            try:
+                found = _fast_scan_windows(str(dir_path), exts, self.MIN_VIDEO_SIZE)
+            except Exception as e:
+                self.log.warning(f"快速目录枚举失败，改用 scandir: {e}")
+            else:
+                yield from found
+                return
+        
+        # 递归搜索所有支持的视频文件（迭代式深度优先），直接使用 scandir 返回的目录项类型
+        stack = [str(dir_path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not name.startswith('.'):  # 跳过隐藏目录
+                                stack.append(entry.path)
+                            continue
+                        _, dot, ext = name.rpartition('.')
+                        if not dot or ext.lower() not in exts:
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue  # 无法访问的文件
+                        if not stat.S_ISREG(st.st_mode) or st.st_size < self.MIN_VIDEO_SIZE:
+                            continue
+                        yield entry.path, name.lower(), st.st_size
+            except OSError as e:
+                self.log.warning(f"无法读取目录: {e}")
     
     def _create_playlist_file(self) -> None:
         """创建播放列表文件"""
         try:
             # 在项目data目录下创建播放列表文件
-            playlist_dir = Path("/opt/mpvPlayer/data") if platform.system().lower() == "linux" else Path(__file__).parent.parent.parent / "data"
+            playlist_dir = Path("/opt/mpvPlayer/data") if _IS_LINUX else Path(__file__).parent.parent.parent / "data"
             playlist_dir.mkdir(parents=True, exist_ok=True)
             
-            self.playlist_file = playlist_dir / "playlist.txt"
+            self.playlist_file = os.fspath(playlist_dir / "playlist.txt")
+            self._ipc_playlist_loaded = False  # 常驻 mpv 需重新加载新的播放列表
             
-            with open(self.playlist_file, 'w', encoding='utf-8') as f:
-                for video_file in self.queue:
-                    f.write(str(video_file) + '\n')
+            # 一次性编码并写入，不经过文本模式的换行转换
+            data = "\n".join(self.queue) + "\n"
+            with open(self.playlist_file, 'wb') as f:
+                f.write(data.encode('utf-8'))
             
             self.log.info(f"播放列表文件已创建: {self.playlist_file}")
             self.log.info(f"播放列表包含 {len(self.queue)} 个视频文件")
@@ -201,18 +527,29 @@ class MpvController:
             self.log.error(f"创建播放列表文件失败: {e}")
             self.use_playlist_mode = False  # 回退到单文件播放模式
 
-    def play(self, file: Path) -> None:
-        """播放文件（异步）"""
-        self._queue_command("_play_internal", file)
+    def ui_ready(self) -> None:
+        """通知控制器界面已显示，可以开始播放"""
+        self._ui_ready.set()
+
+    def play(self, file, index: Optional[int] = None) -> None:
+        """播放文件（异步），已知索引时直接传入"""
+        file = str(file)
+        if index is None:
+            index = self._index_of.get(file, 0)
+        self._queue_command("_play_internal", file, index)
 
     def _is_headless_mode(self) -> bool:
+        """是否在无头模式中运行（初始化时已检测）"""
+        return self.is_headless
+
+    def _compute_headless(self) -> bool:
         """检测是否在无头模式中运行"""
         # Windows系统默认不使用无头模式
-        if platform.system().lower() == "windows":
+        if _IS_WINDOWS:
             return False
         
         # 检查是否在Kylin系统上运行
-        if os.path.exists('/etc/kylin-version'):
+        if self._is_kylin:
             # Kylin系统强制使用图形模式
             self.log.info("检测到Kylin系统，强制使用图形模式")
             return False
@@ -227,190 +564,354 @@ class MpvController:
             return True
         
         # 检查是否在容器中运行
-        if os.path.exists('/.dockerenv') or os.path.exists('/.container'):
+        if self._in_container:
             return True
             
         return False
 
     # 删除远程环境检测功能，因为远程播放已无问题
 
-    def _play_internal(self, file: Path) -> None:
+    def _play_internal(self, file: str, index: int = 0) -> None:
         """内部播放实现（在命令工作线程中执行）"""
-        self.log.info(f"开始播放文件: {file.name}")
+        self.log.info(f"开始播放文件: {os.path.basename(file)}")
         
         # 更新当前文件索引
-        try:
-            self.current_file_index = self.queue.index(file)
-            self.log.info(f"当前播放索引: {self.current_file_index + 1}/{len(self.queue)}")
-        except ValueError:
-            self.current_file_index = 0
+        self.current_file_index = index
+        self.log.info(f"当前播放索引: {index + 1}/{len(self.queue)}")
         
+        # 优先复用常驻 mpv 进程，通过 IPC 切换文件
+        if self.ipc_path and self._ensure_mpv_process():
+            if self._load_via_ipc(file):
+                self._notify_playback_changed()
+                return
+            self.log.warning("IPC 切换文件失败，改为重新启动 MPV")
+        
+        self._spawn_mpv(file)
+    
+    def _spawn_mpv(self, file: str) -> None:
+        """为单个文件启动新的 mpv 进程（Windows 或 IPC 不可用时使用）"""
         # 停止当前播放
         self._stop_current_playback()
         
         # 构建 mpv 命令
-        cmd = [self.mpv_exe]
-        
-        # 检测是否在无头模式中运行
-        is_headless = self._is_headless_mode()
-        
-        if is_headless:
-            self.log.info("检测到无头模式，调整 MPV 参数")
-            # 无头模式下的参数
-            cmd.extend([
-                file.as_posix(),  # 播放单个文件
-                f"--volume={self.volume}",
-                "--no-terminal",
-                "--vo=null",  # 无视频输出
-                "--ao=null",  # 无音频输出
-                "--no-video"  # 不加载视频
-            ])
-        else:
+        if self.use_playlist_mode and self.playlist_file and os.path.exists(self.playlist_file) and not self.is_headless:
             # 使用播放列表模式（麒麟系统推荐）
-            if self.use_playlist_mode and self.playlist_file and self.playlist_file.exists():
-                self.log.info("使用播放列表模式进行播放")
-                cmd.extend(self._build_playlist_command())
-            else:
-                # 单文件播放模式
-                self.log.info("使用单文件播放模式")
-                cmd.extend(self._build_single_file_command(file))
+            self.log.info("使用播放列表模式进行播放")
+            cmd = self._build_playlist_command()
+        else:
+            # 单文件播放模式
+            self.log.info("使用单文件播放模式")
+            cmd = self._build_single_file_command(file)
         
         self.log.info(f"启动 MPV 命令: {' '.join(cmd)}")
         
         # 启动 mpv 进程
+        self.log.info("启动 MPV 进程")
         try:
-            self.log.info("启动 MPV 进程")
-            # 根据操作系统选择不同的启动方式
-            if platform.system().lower() == "windows":
-                # Windows系统使用CREATE_NO_WINDOW避免控制台窗口
-                process = subprocess.Popen(
-                    cmd, 
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
+            if _IS_WINDOWS:
+                try:
+                    # Windows系统使用CREATE_NO_WINDOW避免控制台窗口
+                    process = subprocess.Popen(
+                        cmd, 
+                        creationflags=subprocess.CREATE_NO_WINDOW,
+                        **_POPEN_KWARGS
+                    )
+                except ValueError as e:
+                    # 仅在标志本身不被支持时才去掉标志重试
+                    self.log.warning(f"CREATE_NO_WINDOW 不可用，改为不带标志启动: {e}")
+                    process = subprocess.Popen(cmd, **_POPEN_KWARGS)
             else:
-                # Linux/Unix系统不使用特殊标志
-                process = subprocess.Popen(cmd)
-                
-            self.current_process = process
-            self.log.info(f"MPV 进程已启动，PID: {process.pid}")
+                process = subprocess.Popen(cmd, **_POPEN_KWARGS)
         except Exception as e:
+            # 可执行文件缺失或无权限时重试也会同样失败
             self.log.error(f"启动 MPV 失败: {e}")
-            # 尝试不使用特殊标志
+            return
+        
+        self.current_process = process
+        self.log.info(f"MPV 进程已启动，PID: {process.pid}")
+        self._notify_playback_changed()
+        
+        # 阻塞等待进程退出，替代轮询
+        threading.Thread(target=self._on_process_exit, args=(process,), daemon=True).start()
+    
+    def _ensure_mpv_process(self) -> bool:
+        """确保常驻 mpv 进程（--idle 模式）已启动且 IPC 可用"""
+        process = self.current_process
+        if (process is not None and process is self._ipc_process
+                and process.poll() is None and self._ipc_sock is not None):
+            return True
+        
+        # 按文件启动的旧进程先停止
+        self._stop_current_playback()
+        
+        cmd = self._build_idle_command()
+        try:
+            os.unlink(self.ipc_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.log.warning(f"删除旧的 IPC 套接字失败: {e}")
+        
+        self.log.info(f"启动常驻 MPV 命令: {' '.join(cmd)}")
+        try:
+            process = subprocess.Popen(cmd, **_POPEN_KWARGS)
+        except Exception as e:
+            self.log.error(f"启动常驻 MPV 失败: {e}")
+            return False
+        
+        # 等待 IPC 套接字就绪
+        deadline = time.monotonic() + 3.0
+        while not os.path.exists(self.ipc_path):
+            if process.poll() is not None or time.monotonic() > deadline:
+                self.log.warning("MPV IPC 套接字未就绪，回退到按文件启动")
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                return False
+            time.sleep(0.05)
+        
+        sock = self._connect_ipc()
+        if sock is None:
+            self.log.warning("无法连接 MPV IPC，回退到按文件启动")
+            process.kill()
+            process.wait()
+            return False
+        
+        self.current_process = process
+        self._ipc_process = process
+        self._ipc_playlist_loaded = False
+        self.log.info(f"常驻 MPV 进程已启动，PID: {process.pid}")
+        
+        # 进程意外退出时由等待线程兜底
+        threading.Thread(target=self._on_process_exit, args=(process,), daemon=True).start()
+        self._attach_ipc(process, sock)
+        return True
+    
+    def _connect_ipc(self) -> Optional[socket.socket]:
+        """连接常驻 mpv 的 IPC 套接字（指数退避重试）"""
+        delay = 0.01
+        for _ in range(8):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             try:
-                process = subprocess.Popen(cmd)
-                self.current_process = process
-                self.log.info(f"MPV 进程已启动（不使用特殊标志），PID: {process.pid}")
-            except Exception as e2:
-                self.log.error("第二次启动 MPV 失败: %s", e2)
+                sock.connect(self.ipc_path)
+                return sock
+            except OSError:
+                sock.close()
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+        return None
     
-    def _build_playlist_command(self) -> List[str]:
-        """构建播放列表模式的mpv命令"""
-        cmd = [
-            f"--playlist={self.playlist_file}",
-            "--loop-playlist=inf",
-            f"--volume={self.volume}",
-            "--keep-open=no",
-            "--fullscreen",
-            "--cursor-autohide=3000",
-            "--input-default-bindings=yes"
-        ]
+    def _attach_ipc(self, process: subprocess.Popen, sock: socket.socket) -> None:
+        """启用 IPC 连接：启动读线程并订阅属性变化"""
+        with self._ipc_write_lock:
+            self._ipc_sock = sock
+        # 读线程分发响应与事件
+        threading.Thread(target=self._ipc_reader_loop, args=(process, sock), daemon=True).start()
+        # mpv 自行切换播放列表时同步当前索引
+        self._send_mpv_ipc_command(["observe_property", 1, "playlist-pos"])
+    
+    def _reconnect_ipc(self) -> Optional[socket.socket]:
+        """常驻 mpv 仍在运行但 IPC 连接已断开时重新连接"""
+        process = self._ipc_process
+        if process is None or process is not self.current_process or process.poll() is not None:
+            return None
+        sock = self._connect_ipc()
+        if sock is None:
+            return None
+        self.log.info("已重新连接 MPV IPC")
+        self._attach_ipc(process, sock)
+        return sock
+    
+    def _close_ipc(self) -> None:
+        """关闭 IPC 连接（读线程随之退出）"""
+        with self._ipc_write_lock:
+            sock, self._ipc_sock = self._ipc_sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def _load_via_ipc(self, file: str) -> bool:
+        """通过 IPC 让常驻 mpv 切换到指定文件"""
+        send = self._send_mpv_ipc_command
+        if self.use_playlist_mode and self.playlist_file and os.path.exists(self.playlist_file):
+            self.log.info("使用播放列表模式进行播放")
+            if self._ipc_playlist_loaded:
+                # 播放列表已在 mpv 中，直接跳转
+                return send(["set_property", "playlist-pos", self.current_file_index])
+            ok = (send(["set_property", "loop-file", "no"])
+                  and send(["set_property", "loop-playlist", "inf"])
+                  and send(["set_property", "playlist-start", self.current_file_index])
+                  and send(["loadlist", self.playlist_file, "replace"]))
+            self._ipc_playlist_loaded = ok
+            return ok
         
-        # 添加字幕选项
-        # 根据操作系统选择合适的字幕文件路径
-        if platform.system().lower() == "linux":
-            subtitle_file = Path("/opt/mpvPlayer/data/sub.ass")
-        else:
-            subtitle_file = Path("data/sub.ass")
+        # 单文件播放模式
+        self.log.info("使用单文件播放模式")
+        self._ipc_playlist_loaded = False
+        return (send(["set_property", "loop-playlist", "no"])
+                and send(["set_property", "loop-file", "inf" if self.loop else "no"])
+                and send(["loadfile", file, "replace"]))
+    
+    def _ipc_reader_loop(self, process: subprocess.Popen, sock: socket.socket) -> None:
+        """IPC 读线程：按行解析 mpv 消息，分发命令响应与异步事件"""
+        buffer = b""
+        while True:
+            try:
+                data = sock.recv(4096)
+            except OSError:
+                break
+            if not data:
+                break  # mpv 已退出
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                request_id = message.get("request_id")
+                if request_id is not None:
+                    event = self._ipc_pending.pop(request_id, None)
+                    if event is not None:
+                        self._ipc_responses[request_id] = message
+                        event.set()
+                elif "event" in message:
+                    self._handle_mpv_event(message, process)
         
-        if subtitle_file.exists():
-            cmd.extend([
-                f"--sub-file={subtitle_file.as_posix()}",
-                "--sub-ass=yes",
-                "--sub-visibility=yes"
-            ])
+        # 连接断开：若仍是当前连接，释放仍在等待响应的命令
+        with self._ipc_write_lock:
+            is_current = self._ipc_sock is sock
+            if is_current:
+                self._ipc_sock = None
+        sock.close()
+        if not is_current:
+            return
+        for request_id in list(self._ipc_pending):
+            event = self._ipc_pending.pop(request_id, None)
+            if event is not None:
+                event.set()
+    
+    def _handle_mpv_event(self, message: dict, process: subprocess.Popen) -> None:
+        """处理 mpv 异步事件"""
+        event = message.get("event")
+        if event == "property-change" and message.get("name") == "playlist-pos":
+            position = message.get("data")
+            if self._ipc_playlist_loaded and isinstance(position, int) and position >= 0:
+                self.current_file_index = position
+                self._notify_playback_changed()
+            return
+        if event != "end-file":
+            return
+        # 主动切换产生的 stop 事件、已替换的进程、由 mpv 自行管理的播放列表都不处理
+        if message.get("reason") not in ("eof", "error"):
+            return
+        if process is not self.current_process or not self._running or self._ipc_playlist_loaded:
+            return
+        if self.queue:
+            self.log.info("检测到播放完成，自动播放下一个文件")
+            self._queue_command("_auto_play_next")
+    
+    def _build_base_command(self) -> List[str]:
+        """构建与文件无关的mpv命令前缀（初始化时构建，音量变化时重建）"""
+        cmd = [self.mpv_exe, f"--volume={self.volume}"]
         
-        # 麒麟系统特定设置：禁用问题解码器，使用软件解码
-        if platform.system().lower() == "linux":
+        if self.is_headless:
+            # 无头模式下的参数
             cmd.extend([
-                "--hwdec=no",           # 禁用硬件解码
-                "--vd=lavc,h264",       # 强制使用libavcodec h264解码器
-                "--vo=x11"              # 强制使用x11视频输出
+                "--no-terminal",
+                "--vo=null",  # 无视频输出
+                "--ao=null",  # 无音频输出
+                "--no-video"  # 不加载视频
             ])
+            return cmd
         
-        return cmd
-    
-    def _build_single_file_command(self, file: Path) -> List[str]:
-        """构建单文件播放模式的mpv命令"""
-        cmd = [
-            file.as_posix(),  # 播放单个文件
-            f"--volume={self.volume}",
+        cmd.extend([
             "--keep-open=no",
             "--fullscreen",
-            f"--cursor-autohide={3000}",
+            "--cursor-autohide=3000",
             "--input-default-bindings=yes"
-        ]
-        
-        # 添加字幕选项
-        # 根据操作系统选择合适的字幕文件路径
-        if platform.system().lower() == "linux":
-            subtitle_file = Path("/opt/mpvPlayer/data/sub.ass")
-        else:
-            subtitle_file = Path("data/sub.ass")
-        
-        if subtitle_file.exists():
-            cmd.extend([
-                f"--sub-file={subtitle_file.as_posix()}",
-                "--sub-ass=yes",
-                "--sub-visibility=yes"
-            ])
+        ])
         
         # 麒麟系统特定设置：禁用问题解码器，使用软件解码
-        if platform.system().lower() == "linux":
+        if _IS_LINUX:
             cmd.extend([
                 "--hwdec=no",           # 禁用硬件解码
                 "--vd=lavc,h264",       # 强制使用libavcodec h264解码器
                 "--vo=x11"              # 强制使用x11视频输出
             ])
         
-        # 添加循环设置
-        if self.loop:
+        return cmd
+    
+    def _build_subtitle_options(self) -> List[str]:
+        """构建字幕参数（字幕文件可能在运行中下发，每次启动时检查）"""
+        if not self.is_headless and os.path.exists(self._subtitle_file):
+            return [
+                f"--sub-file={self._subtitle_file}",
+                "--sub-ass=yes",
+                "--sub-visibility=yes"
+            ]
+        return []
+    
+    def _build_idle_command(self) -> List[str]:
+        """构建常驻（--idle）模式的mpv命令"""
+        cmd = [*self._base_cmd, "--idle=yes", f"--input-ipc-server={self.ipc_path}"]
+        if not self.is_headless:
+            cmd.append("--force-window=yes")  # 切换文件时保持窗口，避免闪回桌面
+        cmd.extend(self._build_subtitle_options())
+        return cmd
+    
+    def _build_playlist_command(self) -> List[str]:
+        """构建播放列表模式的mpv命令"""
+        return [
+            *self._base_cmd,
+            f"--playlist={self.playlist_file}",
+            f"--playlist-start={self.current_file_index}",
+            "--loop-playlist=inf",
+            *self._build_subtitle_options()
+        ]
+    
+    def _build_single_file_command(self, file: str) -> List[str]:
+        """构建单文件播放模式的mpv命令"""
+        cmd = [*self._base_cmd, file, *self._build_subtitle_options()]
+        
+        # 添加循环设置（无头模式保持原有行为，不循环；等待切换到播放列表模式时也不循环）
+        if self.loop and not self.is_headless and not self._playlist_pending:
             cmd.append("--loop-file=inf")
         
         return cmd
 
     def _stop_current_playback(self) -> None:
         """停止当前播放（在命令工作线程中执行）"""
-        if not self.current_process:
+        process = self.current_process
+        if not process:
             return
-            
+        
+        # 先解除引用，等待线程据此判断进程是被主动停止的
+        self.current_process = None
+        self._notify_playback_changed()
+        if process is self._ipc_process:
+            self._close_ipc()
+        
         try:
             self.log.info("终止当前播放进程")
-            self.current_process.terminate()
-            
-            # 等待进程终止
-            def wait_for_termination():
-                try:
-                    self.current_process.wait(timeout=3)
-                    self.log.info("播放进程已正常终止")
-                except subprocess.TimeoutExpired:
-                    self.log.warning("进程终止超时，强制杀死进程")
-                    try:
-                        self.current_process.kill()
-                        self.log.info("进程已被强制杀死")
-                    except:
-                        pass
-                finally:
-                    self.current_process = None
-            
-            # 在后台线程中等待进程终止，避免阻塞命令工作线程
-            termination_thread = threading.Thread(target=wait_for_termination, daemon=True)
-            termination_thread.start()
-            
+            process.terminate()
+            # 已在命令工作线程中串行执行，直接等待进程终止
+            try:
+                process.wait(timeout=3)
+                self.log.info("播放进程已正常终止")
+            except subprocess.TimeoutExpired:
+                self.log.warning("进程终止超时，强制杀死进程")
+                process.kill()
+                process.wait(timeout=1)
+                self.log.info("进程已被强制杀死")
         except Exception as e:
-            self.log.warning("终止播放进程时出现异常: %s", e)
+            self.log.warning(f"终止播放进程时出现异常: {e}")
             try:
-                self.current_process.kill()
-                self.current_process = None
+                process.kill()
                 self.log.info("强制杀死播放进程")
             except:
                 pass
@@ -424,17 +925,17 @@ class MpvController:
         self.log.info("用户点击播放/暂停按钮")
         if self.current_process:
             # 优先尝试通过IPC控制
-            if self._send_mpv_ipc_command("cycle pause"):
+            if self._send_mpv_ipc_command(["cycle", "pause"]):
                 self.log.info("通过IPC发送暂停/播放指令")
                 return
             
             # IPC失败则尝试键盘模拟
+            if _pyautogui is None:
+                self.log.warning("pyautogui 不可用，无法控制播放/暂停")
+                return
             try:
-                import pyautogui
-                pyautogui.press('space')
+                _pyautogui.press('space')
                 self.log.info("通过键盘模拟发送暂停/播放指令")
-            except ImportError:
-                self.log.warning("pyautogui 未安装，无法控制播放/暂停")
             except Exception as e:
                 self.log.error("控制播放/暂停失败: %s", e)
         else:
@@ -446,14 +947,24 @@ class MpvController:
 
     def _set_volume_internal(self, vol: int) -> None:
         """内部音量设置实现"""
-        self.volume = max(0, min(vol, 100))
-        # 无法实时调整音量，需要重启播放器
+        vol = max(0, min(vol, 100))
+        if vol == self.volume:
+            return  # 音量未变化，无需通知 mpv
+        self.volume = vol
+        self._base_cmd = self._build_base_command()
+        
+        # 常驻进程通过IPC实时调整音量
+        if self._send_mpv_ipc_command(["set_property", "volume", self.volume]):
+            self.log.info(f"音量已调整为 {self.volume}")
+            return
+        
+        # IPC不可用（按文件启动的进程）时需要重启播放器
         if self.current_process:
             current_file = self._get_current_file()
             if current_file:
-                self._play_internal(current_file)
+                self._spawn_mpv(current_file)
 
-    def _get_current_file(self) -> Optional[Path]:
+    def _get_current_file(self) -> Optional[str]:
         """获取当前播放的文件"""
         with self._lock:
             if self.current_process and self.queue and 0 <= self.current_file_index < len(self.queue):
@@ -478,49 +989,53 @@ class MpvController:
         next_index = (self.current_file_index + 1) % len(self.queue)
         
         # 播放下一个文件
-        self.log.info(f"自动切换到下一个文件: {self.queue[next_index].name}")
-        self._play_internal(self.queue[next_index])
+        self.log.info(f"自动切换到下一个文件: {os.path.basename(self.queue[next_index])}")
+        self._play_internal(self.queue[next_index], next_index)
 
     def stop_play(self) -> None:
         """停止播放（异步）"""
         self._queue_command("_stop_play_internal")
 
-    def _send_mpv_ipc_command(self, command: str) -> bool:
-        """通过IPC发送命令给MPV"""
+    def _send_mpv_ipc_command(self, command: List, timeout: float = 2.0) -> bool:
+        """通过IPC发送命令给MPV，并等待读线程返回的响应"""
+        sock = self._ipc_sock or self._reconnect_ipc()
+        if sock is None:
+            # Windows 上未启用 IPC（按文件启动进程），或常驻进程未运行
+            return False
+        
+        request_id = next(self._ipc_request_ids)
+        event = threading.Event()
+        self._ipc_pending[request_id] = event
+        payload = json.dumps({"command": command, "request_id": request_id}).encode() + b'\n'
         try:
-            import socket
-            import json
-            import platform
-            
-            # 检查操作系统类型
-            system = platform.system().lower()
-            
-            if system == "windows":
-                # Windows系统使用命名管道
-                # 注意：MPV在Windows上默认不启用IPC，这里直接返回False
+            with self._ipc_write_lock:
+                sock.sendall(payload)
+        except OSError as e:
+            # 连接已断开，重新连接后重试一次
+            self._close_ipc()
+            sock = self._reconnect_ipc()
+            try:
+                if sock is None:
+                    raise e
+                with self._ipc_write_lock:
+                    sock.sendall(payload)
+            except OSError as e2:
+                self._ipc_pending.pop(request_id, None)
+                self.log.warning(f"IPC命令失败，将使用备用方案: {e2}")
                 return False
-            else:
-                # Linux/Unix系统使用Unix域套接字
-                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                sock.settimeout(2.0)  # 2秒超时
-                sock.connect("/tmp/mpv-socket")
-                
-                # 发送JSON-RPC命令
-                cmd = {
-                    "command": ["keypress", command] if " " not in command else command.split()
-                }
-                sock.send(json.dumps(cmd).encode() + b'\n')
-                
-                # 读取响应
-                response = sock.recv(1024).decode()
-                sock.close()
-                
-                self.log.debug(f"IPC命令发送成功: {command}")
-                return True
-                
-        except Exception as e:
-            self.log.warning(f"IPC命令失败，将使用备用方案: {e}")
+        
+        if not event.wait(timeout):
+            self._ipc_pending.pop(request_id, None)
+            self.log.warning(f"IPC命令超时: {command}")
+            return False
+        
+        response = self._ipc_responses.pop(request_id, None)
+        if response is None or response.get("error") != "success":
+            self.log.warning(f"IPC命令失败: {command}, 响应: {response}")
             return False
+        
+        self.log.debug(f"IPC命令发送成功: {command}")
+        return True
 
     def _stop_play_internal(self) -> None:
         """内部停止播放实现"""
@@ -532,16 +1047,12 @@ class MpvController:
         self._running = False
         
         # 停止所有工作线程
+        self._command_queue.put(_SHUTDOWN)
         if self._worker_thread and self._worker_thread.is_alive():
             self._worker_thread.join(timeout=5)
             if self._worker_thread.is_alive():
                 self.log.warning("工作线程未能及时终止")
         
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=5)
-            if self._monitor_thread.is_alive():
-                self.log.warning("监控线程未能及时终止")
-        
         # 立即停止当前播放
         if self.current_process:
             try:
@@ -571,41 +1082,60 @@ class MpvController:
             finally:
                 self.current_process = None
         
+        # 删除 IPC 套接字文件
+        if self.ipc_path:
+            try:
+                os.unlink(self.ipc_path)
+            except OSError:
+                pass
+        
         # 清理僵尸进程
         self._cleanup_zombie_processes()
         
         self.log.info("MPV控制器资源清理完成")
     
     def _cleanup_zombie_processes(self) -> None:
-        """清理僵尸进程"""
+        """清理僵尸进程（回收本进程已退出的子进程）"""
+        if not _IS_LINUX:
+            return
+        
         try:
-            import subprocess
-            
-            # 在Linux系统上清理僵尸进程
-            if platform.system().lower() == "linux":
-                # 查找所有defunct的mpv进程
-                try:
-                    result = subprocess.run(
-                        ["ps", "-ef"], 
-                        capture_output=True, 
-                        text=True, 
-                        timeout=5
-                    )
-                    if result.returncode == 0:
-                        lines = result.stdout.split('\n')
-                        for line in lines:
-                            if 'mpv' in line and '<defunct>' in line:
-                                # 提取PID
-                                parts = line.split()
-                                if len(parts) >= 2:
-                                    pid = parts[1]
-                                    try:
-                                        self.log.info(f"发现僵尸MPV进程 PID: {pid}, 尝试清理")
-                                        # 尝试向父进程发送SIGCHLD信号
-                                        subprocess.run(["kill", "-s", "SIGCHLD", pid], timeout=2)
-                                    except:
-                                        pass
-                except Exception as e:
-                    self.log.warning(f"清理僵尸进程时出错: {e}")
+            while True:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break  # 仍有子进程在运行，但没有可回收的
+                self.log.info(f"已回收僵尸子进程 PID: {pid}")
+        except ChildProcessError:
+            pass  # 没有子进程
         except Exception as e:
-            self.log.warning(f"僵尸进程清理功能异常: {e}")
+            self.log.warning(f"清理僵尸进程时出错: {e}")
+        
+        # 其他父进程遗留的僵尸 mpv 无法由本进程回收，仅记录
+        for pid, ppid in self._find_defunct_mpv():
+            self.log.warning(f"发现僵尸MPV进程 PID: {pid}，父进程 PID: {ppid}")
+    
+    @staticmethod
+    def _find_defunct_mpv() -> List[Tuple[int, int]]:
+        """直接读取 /proc/<pid>/stat 查找僵尸 mpv 进程，返回 (pid, ppid)"""
+        found = []
+        try:
+            entries = os.scandir('/proc')
+        except OSError:
+            return found
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{entry.name}/stat', 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue  # 进程已退出
+                # 格式: pid (comm) state ppid ...，comm 中可能含空格和括号
+                start = data.find(b'(')
+                end = data.rfind(b')')
+                if data[start + 1:end] != b'mpv' or data[end + 2:end + 3] != b'Z':
+                    continue
+                fields = data[end + 2:].split()
+                found.append((int(entry.name), int(fields[1])))
+        return found
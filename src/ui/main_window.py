@@ -1,24 +1,156 @@
+import os
+import time
+import functools
+import threading
+import weakref
 from PySide6 import QtWidgets, QtGui, QtCore
-from PySide6.QtCore import Qt, QTimer, QDateTime
-from typing import Optional
+from PySide6.QtCore import Qt, QTimer
+from typing import Callable, Optional
 from ..config.models import AppConfig
 from ..comm.mqtt_service import MqttService
 from ..file_dist.manager import DownloadManager
 from ..player.mpv_controller import MpvController
 from ..player.camera_controller import CameraController
 from ..camera.camera_capture import AICameraController
+from ..utils.logger import get_logger
+
+
+# 状态标签和按钮通过动态属性 state 选择样式，样式表只在窗口上解析一次
+_STATE_OK = "ok"
+_STATE_ERR = "err"
+_STATE_OFF = "off"
+_STATE_WARN = "warn"
+_STATE_BTN_START = "start"
+_STATE_BTN_STOP = "stop"
+_WINDOW_QSS = (
+    "QLabel[state='ok'] { color: green; font-weight: bold; }"
+    "QLabel[state='warn'] { color: orange; font-weight: bold; }"
+    "QLabel[state='err'] { color: red; font-weight: bold; }"
+    "QLabel[state='off'] { color: gray; font-weight: bold; }"
+    "QPushButton[state='start'] { background-color: #4CAF50; color: white; font-weight: bold; }"
+    "QPushButton[state='stop'] { background-color: #f44336; color: white; font-weight: bold; }"
+)
+
+# 窗口隐藏且未启用AI时，摄像头只按此频率解码（其余帧仅 grab）
+_HIDDEN_RETRIEVE_FPS = 2
+
+# AI分析结果文本模板：各段在导入时拼好，最常见的完整结果只需一次 format
+_AI_HEADER = "=== AI分析结果 ==="
+_AI_DETECTION_TEMPLATE = "👥 检测人数: {pc}\n📏 检测框数: {dc}"
+_AI_CONFIDENCE_TEMPLATE = "🎯 置信度: {cs}"
+_AI_STATISTICS_TEMPLATE = "📊 当前人数: {cur}\n📈 平均人数: {avg:.1f}\n📈 趋势: {tr}"
+_AI_FULL_TEMPLATE = "\n".join((_AI_HEADER, _AI_DETECTION_TEMPLATE, _AI_CONFIDENCE_TEMPLATE, _AI_STATISTICS_TEMPLATE))
+
+
+def _set_state(widget: QtWidgets.QWidget, state: str) -> None:
+    """切换控件的 state 属性并只重新应用该控件的样式"""
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+class _SaveJob(QtCore.QRunnable):
+    """在线程池中保存照片，完成后通过信号回到界面线程"""
+
+    def __init__(self, camera_controller, file_path: str, done: QtCore.SignalInstance):
+        super().__init__()
+        self.camera_controller = camera_controller
+        self.file_path = file_path
+        self.done = done
+        self.log = get_logger("ui.capture")
+
+    def run(self) -> None:
+        success = False
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            success = self.camera_controller.capture_image(self.file_path)
+        except Exception as e:
+            self.log.error(f"拍照错误: {e}", exc_info=True)
+        self.done.emit(self.file_path, success)
+
+
+class QueueModel(QtCore.QAbstractListModel):
+    """播放队列的只读模型，只为可见行生成显示文本"""
+
+    def __init__(self, player: MpvController, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self.player = player
+        self._count = 0  # 上次同步时的队列长度，扫描线程追加期间保持稳定
+        self._queue_ref = None  # 上次同步时的队列列表对象（持有引用，避免 id 被复用）
+
+    def reload(self) -> None:
+        """队列变化后按差异同步模型：追加只插入新行，等长替换只刷新文本，其余情况才整体重置"""
+        queue = self.player.queue
+        count = len(queue)
+        old = self._count
+        if queue is self._queue_ref and count >= old:
+            # 同一列表对象只会在末尾追加（扫描分批发布）
+            if count > old:
+                self.beginInsertRows(QtCore.QModelIndex(), old, count - 1)
+                self._count = count
+                self.endInsertRows()
+            return
+        self._queue_ref = queue
+        if count == old:
+            # 扫描结束后换成排序后的同长度列表：行数不变，只通知文本变化
+            if count:
+                self.dataChanged.emit(self.index(0), self.index(count - 1), [Qt.DisplayRole])
+            return
+        self.beginResetModel()
+        self._count = count
+        self.endResetModel()
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        queue = self.player.queue
+        if row >= len(queue):
+            return None
+        return f"{row + 1}. {os.path.basename(queue[row])}"
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    queue_changed = QtCore.Signal()  # 播放队列变化（可从任意线程发射）
+    capture_done = QtCore.Signal(str, bool)  # 拍照完成 (文件路径, 是否成功)
+    mqtt_state_changed = QtCore.Signal(bool)  # MQTT 连接状态变化（网络线程发射）
+    playback_changed = QtCore.Signal()  # 播放进程或当前文件变化（播放器工作线程发射）
+    tasks_changed = QtCore.Signal()  # 下载任务列表变化
+    ai_result_pending = QtCore.Signal()  # 有待显示的 AI 分析结果（只在空槽变为有结果时发射）
+
     def __init__(self, cfg: AppConfig, mqtt: Optional[MqttService], downloader: DownloadManager, player: MpvController):
         super().__init__()
         self.cfg = cfg
         self.mqtt = mqtt
         self.downloader = downloader
         self.player = player
+        self.log = get_logger("ui")
+        self._last_queue_sig = None  # 上次刷新播放列表时的队列签名 (版本, 长度, 列表对象)
+        self._last = {}  # 标签键 -> 上次设置的 (文本, 状态)
+        self._status_gen = 0  # 摄像头状态文本的版本号，过期的延时恢复会被忽略
+        self._pending_ai_result = None  # 单槽：只保留最新一条未显示的 AI 分析结果
+        self._pending_ai_lock = threading.Lock()  # 仅保护单槽的取放，临界区只有两次赋值
+        self._ai_fp = None  # 上次显示的检测/统计结果指纹
+        self._ai_text = None  # AI结果文本框当前内容
+        self._ai_widgets_ready = False  # AI结果文本框和性能标签是否已创建
+        
+        # 协作对象的属性在窗口生命周期内不变，启动时探测一次
+        self._has_queue = hasattr(self.player, 'queue') and hasattr(self.player, 'current_file_index')
+        self._has_loop = hasattr(self.player, 'loop')
+        self._has_current_file = hasattr(self.player, '_get_current_file')
+        self._has_tasks = hasattr(self.downloader, 'tasks')
+        self._has_mqtt_client = self.mqtt is not None and hasattr(self.mqtt, 'client')
         
         # 初始化AI摄像头控制器
         self.camera_controller = AICameraController()
+        # 分析回调只弱引用窗口：窗口销毁后分析线程晚到的结果直接丢弃
+        self._ai_callback = self._weak_callback(self._on_analysis_result)
         
         self.setWindowTitle("广告屏播放器控制台")
         self.resize(1200, 800)
@@ -26,25 +158,51 @@ class MainWindow(QtWidgets.QMainWindow):
         self._build_ui()
         self._setup_timer()
         
+        # 播放列表由队列变化事件驱动刷新，跨线程信号自动排队到界面线程
+        self.queue_changed.connect(self._on_queue_changed)
+        self.capture_done.connect(self._on_capture_done)
+        self.ai_result_pending.connect(self._drain_ai, Qt.QueuedConnection)
+        
+        # MQTT 连接状态由连接/断开事件推送，不在定时器中轮询客户端
+        self._mqtt_connected = self._has_mqtt_client and self.mqtt.client.connected
+        if self._has_mqtt_client:
+            self.mqtt_state_changed.connect(self._on_mqtt_state, Qt.QueuedConnection)
+            self.mqtt.set_connection_callback(self.mqtt_state_changed.emit)
+        self.player.set_queue_changed_callback(self.queue_changed.emit)
+        self.playback_changed.connect(self._on_playback_changed)
+        self.player.set_playback_changed_callback(self.playback_changed.emit)
+        if hasattr(self.downloader, 'set_tasks_changed_callback'):
+            self.tasks_changed.connect(self._on_tasks_changed)
+            self.downloader.set_tasks_changed_callback(self.tasks_changed.emit)
+        
         # 启动摄像头
         self._setup_camera()
 
     def _build_ui(self) -> None:
-        # 创建主布局
-        central = QtWidgets.QWidget()
-        main_layout = QtWidgets.QHBoxLayout()
-        
-        # 左侧：状态面板
-        left_panel = self._create_status_panel()
-        
-        # 右侧：控制面板
-        right_panel = self._create_control_panel()
-        
-        main_layout.addWidget(left_panel, 1)
-        main_layout.addWidget(right_panel, 2)
-        
-        central.setLayout(main_layout)
-        self.setCentralWidget(central)
+        # 创建主布局：状态页默认显示（摄像头初始化依赖其中控件），其余页首次切换时才构建
+        self.setStyleSheet(_WINDOW_QSS)
+        self.tabs = QtWidgets.QTabWidget()
+        self.tabs.addTab(self._create_status_panel(), "状态")
+        self.queue_model = None
+        self._lazy_tabs = {
+            self.tabs.addTab(QtWidgets.QWidget(), "控制"): self._create_control_panel,
+        }
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self.setCentralWidget(self.tabs)
+
+    def _on_tab_changed(self, index: int) -> None:
+        """首次切换到某页时构建其内容"""
+        builder = self._lazy_tabs.pop(index, None)
+        if builder is None:
+            return
+        page_layout = QtWidgets.QVBoxLayout(self.tabs.widget(index))
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        page_layout.addWidget(builder())
+        if not self._lazy_tabs:
+            self.tabs.currentChanged.disconnect(self._on_tab_changed)
+        # 新建的播放列表需要立即填充
+        self._last_queue_sig = None
+        self._update_playlist()
 
     def _create_status_panel(self) -> QtWidgets.QGroupBox:
         """创建状态监控面板"""
@@ -58,7 +216,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.time_label = QtWidgets.QLabel("加载中...")
         self.uptime_label = QtWidgets.QLabel("0 小时 0 分钟")
         self.mqtt_status = QtWidgets.QLabel("未连接")
-        self.mqtt_status.setStyleSheet("color: red; font-weight: bold;")
+        _set_state(self.mqtt_status, _STATE_ERR)
         
         sys_layout.addRow("当前时间:", self.time_label)
         sys_layout.addRow("运行时间:", self.uptime_label)
@@ -71,10 +229,10 @@ class MainWindow(QtWidgets.QMainWindow):
         
         self.current_file = QtWidgets.QLabel("无")
         self.play_status = QtWidgets.QLabel("未播放")
-        self.play_status.setStyleSheet("color: orange; font-weight: bold;")
+        _set_state(self.play_status, _STATE_WARN)
         self.queue_count = QtWidgets.QLabel("0")
         self.loop_status = QtWidgets.QLabel("关闭")
-        self.loop_status.setStyleSheet("color: green; font-weight: bold;")
+        _set_state(self.loop_status, _STATE_OK)
         
         play_layout.addRow("当前文件:", self.current_file)
         play_layout.addRow("播放状态:", self.play_status)
@@ -104,6 +262,7 @@ class MainWindow(QtWidgets.QMainWindow):
         device_layout.addWidget(QtWidgets.QLabel("摄像头设备:"))
         self.camera_device_combo = QtWidgets.QComboBox()
         self.camera_device_combo.addItem("自动检测", -1)
+        self.camera_device_combo.currentIndexChanged.connect(self._on_camera_device_changed)
         device_layout.addWidget(self.camera_device_combo)
         device_layout.addStretch(1)
         
@@ -127,7 +286,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ai_analysis_btn.setEnabled(False)
         
         # 设置AI按钮样式
-        self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; }")
+        _set_state(self.ai_analysis_btn, _STATE_BTN_START)
         
         control_layout.addWidget(self.camera_start_btn)
         control_layout.addWidget(self.camera_stop_btn)
@@ -138,37 +297,60 @@ class MainWindow(QtWidgets.QMainWindow):
         
         # 摄像头状态显示
         self.camera_status = QtWidgets.QLabel("摄像头未启动")
-        self.camera_status.setStyleSheet("color: gray; font-weight: bold;")
+        _set_state(self.camera_status, _STATE_OFF)
         
         # 摄像头画面显示
         camera_layout.addLayout(device_layout)
         camera_layout.addLayout(control_layout)
         camera_layout.addWidget(self.camera_status)
         
-        # 创建摄像头显示区域（先创建占位符，稍后更新）
-        self.camera_display_area = QtWidgets.QWidget()
-        camera_display_layout = QtWidgets.QVBoxLayout()
-        self.camera_display_area.setLayout(camera_display_layout)
-        self.camera_display_area.setMinimumSize(320, 240)
-        camera_layout.addWidget(self.camera_display_area)
+        # 创建摄像头显示区域：第 0 页为占位符，第 1 页为摄像头控件（稍后加入）
+        self.camera_stack = QtWidgets.QStackedWidget()
+        self.camera_stack.setMinimumSize(320, 240)
+        placeholder = QtWidgets.QLabel("摄像头控件未初始化")
+        placeholder.setAlignment(QtCore.Qt.AlignCenter)
+        placeholder.setStyleSheet("color: gray; font-size: 14px;")
+        self.camera_stack.addWidget(placeholder)
+        self._camera_page = None  # 当前放在第 1 页的摄像头控件
+        camera_layout.addWidget(self.camera_stack)
         
         camera_group.setLayout(camera_layout)
         
-        # AI分析结果显示区域（独立于摄像头画面）
+        # AI分析结果显示区域（独立于摄像头画面）；结果文本框和性能标签在首次启用AI时才创建
         ai_analysis_group = QtWidgets.QGroupBox("AI分析结果")
-        ai_layout = QtWidgets.QVBoxLayout()
+        self._ai_layout = QtWidgets.QVBoxLayout()
         
         # 分析结果状态标签
         self.ai_status_label = QtWidgets.QLabel("AI分析未启用")
-        self.ai_status_label.setStyleSheet("color: gray; font-weight: bold;")
-        ai_layout.addWidget(self.ai_status_label)
+        _set_state(self.ai_status_label, _STATE_OFF)
+        self._ai_layout.addWidget(self.ai_status_label)
+        ai_analysis_group.setLayout(self._ai_layout)
+        
+        layout.addWidget(sys_group)
+        layout.addWidget(play_group)
+        layout.addWidget(download_group)
+        layout.addWidget(camera_group)
+        layout.addWidget(ai_analysis_group)
+        layout.addStretch(1)
+        
+        panel.setLayout(layout)
+        return panel
+    
+    def _ensure_ai_widgets(self) -> None:
+        """首次需要显示AI结果时创建结果文本框和性能标签（界面线程）"""
+        if self._ai_widgets_ready:
+            return
+        self._ai_widgets_ready = True
+        ai_layout = self._ai_layout
         
         # 分析结果详细信息区域
-        self.ai_results_text = QtWidgets.QTextEdit()
+        # 纯文本控件：无富文本解析和排版，块数上限防止文档无限增长
+        self.ai_results_text = QtWidgets.QPlainTextEdit()
         self.ai_results_text.setReadOnly(True)
+        self.ai_results_text.setMaximumBlockCount(20)
         self.ai_results_text.setMaximumHeight(120)
         self.ai_results_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #f8f9fa;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -177,7 +359,6 @@ class MainWindow(QtWidgets.QMainWindow):
                 font-size: 10px;
             }
         """)
-        self.ai_results_text.setPlainText("等待AI分析结果...")
         ai_layout.addWidget(self.ai_results_text)
         
         # 性能统计信息
@@ -193,17 +374,6 @@ class MainWindow(QtWidgets.QMainWindow):
         performance_layout.addStretch(1)
         
         ai_layout.addLayout(performance_layout)
-        ai_analysis_group.setLayout(ai_layout)
-        
-        layout.addWidget(sys_group)
-        layout.addWidget(play_group)
-        layout.addWidget(download_group)
-        layout.addWidget(camera_group)
-        layout.addWidget(ai_analysis_group)
-        layout.addStretch(1)
-        
-        panel.setLayout(layout)
-        return panel
 
     def _create_control_panel(self) -> QtWidgets.QGroupBox:
         """创建控制面板"""
@@ -214,9 +384,14 @@ class MainWindow(QtWidgets.QMainWindow):
         playlist_group = QtWidgets.QGroupBox("播放列表")
         playlist_layout = QtWidgets.QVBoxLayout()
         
-        self.playlist_widget = QtWidgets.QListWidget()
+        # 使用模型/视图，只渲染可见行
+        self.queue_model = QueueModel(self.player, self)
+        self.playlist_widget = QtWidgets.QListView()
         self.playlist_widget.setMaximumHeight(200)
-        self.playlist_widget.itemDoubleClicked.connect(self._play_selected_file)
+        self.playlist_widget.setUniformItemSizes(True)
+        self.playlist_widget.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.playlist_widget.setModel(self.queue_model)
+        self.playlist_widget.doubleClicked.connect(self._play_selected_file)
         playlist_layout.addWidget(self.playlist_widget)
         playlist_group.setLayout(playlist_layout)
         
@@ -230,124 +405,193 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _setup_timer(self) -> None:
         """设置定时刷新"""
-        self.start_time = QDateTime.currentDateTime()
+        self._start_monotonic = time.monotonic()  # 运行时长基准，不受系统时间调整影响
+        self._last_sec = -1  # 上次显示的时间（整秒）
         
-        timer = QTimer(self)
-        timer.setInterval(1000)
-        timer.timeout.connect(self.refresh)
-        timer.start()
+        # 时间按整秒边界单次定时、每次刷新后重新排期；状态由各来源的变化信号推送，另以 10 秒低频兜底对账
+        self._t_fast = QTimer(self)
+        self._t_fast.setSingleShot(True)
+        self._t_fast.setInterval(1000)
+        self._t_fast.timeout.connect(self._tick_time)
+        self._t_fast.start()
+
+        self._t_mid = QTimer(self)
+        self._t_mid.setInterval(10000)
+        self._t_mid.timeout.connect(self._tick_status)
+        self._t_mid.start()
+        
+        self._timers = (self._t_fast, self._t_mid)
+
+    def _set(self, key: str, widget: QtWidgets.QLabel, text: str, state: Optional[str] = None) -> None:
+        """仅在内容或状态变化时更新标签，避免重复重绘和重新应用样式"""
+        last_text, last_state = self._last.get(key, (None, None))
+        if text != last_text:
+            widget.setText(text)
+        if state is not None and state != last_state:
+            _set_state(widget, state)
+        self._last[key] = (text, state if state is not None else last_state)
+
+    def _is_shown(self) -> bool:
+        """窗口可见且未最小化"""
+        return self.isVisible() and not self.isMinimized()
 
     def refresh(self) -> None:
-        """刷新界面状态"""
-        # 更新时间
-        current_time = QDateTime.currentDateTime()
-        self.time_label.setText(current_time.toString("yyyy-MM-dd hh:mm:ss"))
+        """立即刷新全部界面状态"""
+        self._tick_time()
+        self._tick_status()
+        self._update_playlist()
+
+    def _tick_time(self) -> None:
+        """刷新时间和运行时长"""
+        if not self._is_shown():
+            return
+        # 下一次在下个整秒之后触发，时间显示不会漏秒，也没有多余唤醒
+        now = time.time()
+        self._t_fast.start(1001 - int(now * 1000) % 1000)
+        # 更新时间（同一秒内不重复格式化）
+        sec = int(now)
+        if sec == self._last_sec:
+            return
+        self._last_sec = sec
+        self.time_label.setText(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
         
         # 计算运行时间
-        uptime_secs = self.start_time.secsTo(current_time)
+        uptime_secs = int(time.monotonic() - self._start_monotonic)
         hours = uptime_secs // 3600
         minutes = (uptime_secs % 3600) // 60
-        self.uptime_label.setText(f"{hours} 小时 {minutes} 分钟")
-        
-        # 更新MQTT状态
-        if self.mqtt and hasattr(self.mqtt, 'client'):
-            mqtt_connected = self.mqtt.client.connected
-            if mqtt_connected:
-                self.mqtt_status.setText("已连接")
-                self.mqtt_status.setStyleSheet("color: green; font-weight: bold;")
+        self._set("uptime", self.uptime_label, f"{hours} 小时 {minutes} 分钟")
+
+    def _on_mqtt_state(self, connected: bool) -> None:
+        """MQTT 连接状态变化（界面线程）"""
+        self._mqtt_connected = connected
+        if self._is_shown():
+            self._update_mqtt_label()
+
+    def _tick_status(self) -> None:
+        """兜底刷新全部状态标签（各项状态平时由事件推送更新）"""
+        if not self._is_shown():
+            return
+        self._update_mqtt_label()
+        self._update_play_labels()
+        self._update_queue_labels()
+        self._update_download_label()
+
+    def _update_mqtt_label(self) -> None:
+        """更新MQTT状态"""
+        if self._has_mqtt_client:
+            if self._mqtt_connected:
+                self._set("mqtt", self.mqtt_status, "已连接", _STATE_OK)
             else:
-                self.mqtt_status.setText("连接中...")
-                self.mqtt_status.setStyleSheet("color: orange; font-weight: bold;")
+                self._set("mqtt", self.mqtt_status, "连接中...", _STATE_WARN)
         else:
             if self.cfg.mqtt.enabled:
-                self.mqtt_status.setText("正在启动...")
-                self.mqtt_status.setStyleSheet("color: orange; font-weight: bold;")
+                self._set("mqtt", self.mqtt_status, "正在启动...", _STATE_WARN)
             else:
-                self.mqtt_status.setText("未启用")
-                self.mqtt_status.setStyleSheet("color: gray; font-weight: bold;")
-        
-        # 更新播放状态
+                self._set("mqtt", self.mqtt_status, "未启用", _STATE_OFF)
+
+    def _update_play_labels(self) -> None:
+        """更新播放状态和当前文件"""
+        _set = self._set
         if self.player.current_process:
-            self.play_status.setText("播放中")
-            self.play_status.setStyleSheet("color: green; font-weight: bold;")
+            _set("play", self.play_status, "播放中", _STATE_OK)
             
             # 更新当前播放文件
             current_file = self._get_current_playing_file()
             if current_file:
-                self.current_file.setText(current_file)
+                _set("file", self.current_file, current_file)
             else:
-                self.current_file.setText("播放中...")
+                _set("file", self.current_file, "播放中...")
         else:
-            self.play_status.setText("未播放")
-            self.play_status.setStyleSheet("color: orange; font-weight: bold;")
-            self.current_file.setText("无")
-        
-        # 更新播放队列
-        queue_len = len(self.player.queue) if hasattr(self.player, 'queue') else 0
-        self.queue_count.setText(str(queue_len))
-        
-        # 更新循环播放状态
-        if hasattr(self.player, 'loop'):
-            loop_text = "开启" if self.player.loop else "关闭"
-            loop_color = "green" if self.player.loop else "red"
-            self.loop_status.setText(loop_text)
-            self.loop_status.setStyleSheet(f"color: {loop_color}; font-weight: bold;")
-        else:
-            self.loop_status.setText("未知")
-            self.loop_status.setStyleSheet("color: gray; font-weight: bold;")
-        
-        # 更新下载状态
-        download_tasks = len(self.downloader.tasks) if hasattr(self.downloader, 'tasks') else 0
-        self.download_queue.setText(str(download_tasks))
+            _set("play", self.play_status, "未播放", _STATE_WARN)
+            _set("file", self.current_file, "无")
+
+    def _update_queue_labels(self) -> None:
+        """更新播放队列长度和循环播放状态"""
+        _set = self._set
+        queue_len = len(self.player.queue) if self._has_queue else 0
+        _set("queue", self.queue_count, str(queue_len))
         
-        # 更新播放列表
+        if self._has_loop:
+            if self.player.loop:
+                _set("loop", self.loop_status, "开启", _STATE_OK)
+            else:
+                _set("loop", self.loop_status, "关闭", _STATE_ERR)
+        else:
+            _set("loop", self.loop_status, "未知", _STATE_OFF)
+
+    def _update_download_label(self) -> None:
+        """更新下载队列长度"""
+        download_tasks = len(self.downloader.tasks) if self._has_tasks else 0
+        self._set("download", self.download_queue, str(download_tasks))
+
+    def _on_playback_changed(self) -> None:
+        """播放进程或当前文件变化（界面线程）"""
+        if self._is_shown():
+            self._update_play_labels()
+
+    def _on_queue_changed(self) -> None:
+        """播放队列变化（界面线程）"""
+        if self._is_shown():
+            self._update_queue_labels()
         self._update_playlist()
 
+    def _on_tasks_changed(self) -> None:
+        """下载任务变化（界面线程）"""
+        if self._is_shown():
+            self._update_download_label()
+
     def _update_playlist(self) -> None:
         """更新播放列表显示"""
-        if not hasattr(self.player, 'queue'):
+        if not self._has_queue or self.queue_model is None or not self._is_shown():
             return
-            
-        self.playlist_widget.clear()
-        for i, file_path in enumerate(self.player.queue):
-            item = QtWidgets.QListWidgetItem(f"{i+1}. {file_path.name}")
-            self.playlist_widget.addItem(item)
+        
+        # 队列未变化时不重置模型；长度和列表对象兜底未递增版本号的修改
+        player = self.player
+        queue = player.queue
+        sig = (player.playlist_version, len(queue), id(queue))
+        if sig == self._last_queue_sig:
+            return
+        self._last_queue_sig = sig
+        
+        self.queue_model.reload()
 
 
     
-    def _play_selected_file(self, item) -> None:
+    def _play_selected_file(self, model_index: QtCore.QModelIndex) -> None:
         """播放选中的文件"""
         try:
             # 获取选中项的索引
-            index = self.playlist_widget.row(item)
+            index = model_index.row()
             if 0 <= index < len(self.player.queue):
                 selected_file = self.player.queue[index]
-                print(f"播放选中的文件: {selected_file.name}")
+                self.log.info(f"播放选中的文件: {os.path.basename(selected_file)}")
                 
                 # 设置当前文件索引并播放
                 self.player.current_file_index = index
-                self.player.play(selected_file)
+                self.player.play(selected_file, index)
             else:
-                print("无效的播放列表索引")
+                self.log.warning("无效的播放列表索引")
         except Exception as e:
-            print(f"播放选中文件时出错: {e}")
+            self.log.error(f"播放选中文件时出错: {e}")
     
     def _get_current_playing_file(self) -> str:
         """获取当前播放的文件名"""
-        try:
-            if hasattr(self.player, 'queue') and hasattr(self.player, 'current_file_index'):
-                if 0 <= self.player.current_file_index < len(self.player.queue):
-                    current_file = self.player.queue[self.player.current_file_index]
-                    return current_file.name
-                
-            # 如果无法通过索引获取，尝试通过其他方式
-            if hasattr(self.player, '_get_current_file'):
-                current_file = self.player._get_current_file()
+        player = self.player
+        if self._has_queue:
+            # 队列和索引各读一次，避免检查与取值之间被工作线程替换
+            queue = player.queue
+            index = player.current_file_index
+            if 0 <= index < len(queue):
+                return os.path.basename(queue[index])
+        
+        # 如果无法通过索引获取，尝试通过其他方式（少见路径才需要异常保护）
+        if self._has_current_file:
+            try:
+                current_file = player._get_current_file()
                 if current_file:
-                    return current_file.name
-                    
-        except Exception as e:
-            print(f"获取当前播放文件时出错: {e}")
+                    return os.path.basename(current_file)
+            except Exception as e:
+                self.log.warning(f"获取当前播放文件时出错: {e}")
             
         return ""
     
@@ -361,20 +605,23 @@ class MainWindow(QtWidgets.QMainWindow):
         }
         
         try:
+            player = self.player
+            
             # 播放状态
-            info["playing"] = bool(self.player.current_process)
+            info["playing"] = bool(player.current_process)
             
-            # 文件队列信息
-            if hasattr(self.player, 'queue'):
-                info["total_files"] = len(self.player.queue)
+            # 文件队列信息（队列和索引各读一次）
+            if self._has_queue:
+                queue = player.queue
+                index = player.current_file_index
+                info["total_files"] = len(queue)
                 
-                if hasattr(self.player, 'current_file_index') and 0 <= self.player.current_file_index < len(self.player.queue):
-                    current_file = self.player.queue[self.player.current_file_index]
-                    info["current_file"] = current_file.name
-                    info["current_index"] = self.player.current_file_index + 1
+                if 0 <= index < len(queue):
+                    info["current_file"] = os.path.basename(queue[index])
+                    info["current_index"] = index + 1
                     
         except Exception as e:
-            print(f"获取播放文件信息时出错: {e}")
+            self.log.warning(f"获取播放文件信息时出错: {e}")
             
         return info
 
@@ -386,15 +633,19 @@ class MainWindow(QtWidgets.QMainWindow):
                 camera_index=2,  # 默认使用摄像头2
                 resolution=(640, 480), 
                 fps=15,
+                buffer_size=1,  # 只保留最新一帧，降低预览延迟
                 enable_ai=True,  # 启用AI分析
                 model_path="models/yolov5s.onnx"  # AI模型路径
             )
             
             if success:
-                print("摄像头控制器初始化成功")
+                self.log.info("摄像头控制器初始化成功")
                 
                 # 设置分析结果回调函数
-                self.camera_controller.set_analysis_callback(self._on_analysis_result)
+                self.camera_controller.set_analysis_callback(self._ai_callback)
+                
+                # 帧在采集线程直接写入环形缓冲，不经界面线程；界面线程只负责控件刷新
+                self.camera_controller.frameReady.connect(self._on_camera_frame, Qt.DirectConnection)
                 
                 # 更新设备选择框
                 self._update_camera_device_list()
@@ -405,69 +656,64 @@ class MainWindow(QtWidgets.QMainWindow):
                 # 自动启动摄像头
                 self._start_camera()
             else:
-                print("摄像头控制器初始化失败")
-                self.camera_status.setText("摄像头初始化失败")
-                self.camera_status.setStyleSheet("color: red; font-weight: bold;")
+                self.log.warning("摄像头控制器初始化失败")
+                self._set_camera_status("摄像头初始化失败")
+                _set_state(self.camera_status, _STATE_ERR)
                 
         except Exception as e:
-            print(f"摄像头设置错误: {e}")
-            self.camera_status.setText(f"摄像头错误: {e}")
-            self.camera_status.setStyleSheet("color: red; font-weight: bold;")
+            self.log.error(f"摄像头设置错误: {e}", exc_info=True)
+            self._set_camera_status(f"摄像头错误: {e}")
+            _set_state(self.camera_status, _STATE_ERR)
     
     def _update_camera_device_list(self):
         """更新摄像头设备列表"""
+        # 重建列表期间屏蔽信号（信号只在创建控件时连接一次），避免触发设备切换
+        combo = self.camera_device_combo
+        combo.blockSignals(True)
         try:
             # 清空现有设备列表
-            self.camera_device_combo.clear()
-            self.camera_device_combo.addItem("自动检测", -1)
+            combo.clear()
+            combo.addItem("自动检测", -1)
             
-            # 添加可用的摄像头设备
+            # 添加可用的摄像头设备，同时记录设备索引 -> 行号
             if hasattr(self.camera_controller, 'available_cameras'):
                 available_cameras = self.camera_controller.available_cameras
                 
                 if available_cameras:
+                    cam_index_to_row = {}
                     for cam_index in available_cameras:
-                        self.camera_device_combo.addItem(f"摄像头 {cam_index}", cam_index)
+                        cam_index_to_row[cam_index] = combo.count()
+                        combo.addItem(f"摄像头 {cam_index}", cam_index)
                     
                     # 选择当前使用的摄像头
-                    current_index = self.camera_controller.camera_index
-                    for i in range(self.camera_device_combo.count()):
-                        if self.camera_device_combo.itemData(i) == current_index:
-                            self.camera_device_combo.setCurrentIndex(i)
-                            break
+                    combo.setCurrentIndex(cam_index_to_row.get(self.camera_controller.camera_index, 0))
                 else:
-                    self.camera_device_combo.addItem("未检测到摄像头", -1)
-            
-            # 连接设备选择信号
-            self.camera_device_combo.currentIndexChanged.connect(self._on_camera_device_changed)
+                    combo.addItem("未检测到摄像头", -1)
             
         except Exception as e:
-            print(f"更新设备列表错误: {e}")
+            self.log.error(f"更新设备列表错误: {e}", exc_info=True)
+        finally:
+            combo.blockSignals(False)
     
     def _update_camera_display(self):
         """更新摄像头显示控件"""
         try:
-            # 清空现有显示区域
-            layout = self.camera_display_area.layout()
-            while layout.count():
-                item = layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
-            # 添加摄像头控件
             camera_widget = self.camera_controller.get_widget()
-            if camera_widget:
-                layout.addWidget(camera_widget)
-                print("摄像头显示控件已添加到界面")
-            else:
-                # 如果没有摄像头控件，显示提示信息
-                placeholder = QtWidgets.QLabel("摄像头控件未初始化")
-                placeholder.setAlignment(QtCore.Qt.AlignCenter)
-                placeholder.setStyleSheet("color: gray; font-size: 14px;")
-                layout.addWidget(placeholder)
+            if camera_widget is not self._camera_page:
+                # 重新初始化后控制器换了新控件，只替换这一页；旧控件已被控制器丢弃
+                if self._camera_page is not None:
+                    self.camera_stack.removeWidget(self._camera_page)
+                    self._camera_page.deleteLater()
+                if camera_widget:
+                    self.camera_stack.addWidget(camera_widget)
+                    self.log.info("摄像头显示控件已添加到界面")
+                self._camera_page = camera_widget
+            
+            # 没有摄像头控件时显示占位提示
+            self.camera_stack.setCurrentIndex(1 if camera_widget else 0)
                 
         except Exception as e:
-            print(f"更新摄像头显示错误: {e}")
+            self.log.error(f"更新摄像头显示错误: {e}", exc_info=True)
     
     def _on_camera_device_changed(self, index):
         """摄像头设备选择变化"""
@@ -478,12 +724,11 @@ class MainWindow(QtWidgets.QMainWindow):
                 ai_was_enabled = self.camera_controller.ai_enabled
                 # 如果AI分析正在运行，先停止
                 if ai_was_enabled:
-                    print("[设备切换] 停止AI分析...")
+                    self.log.info("[设备切换] 停止AI分析...")
                     self.camera_controller.disable_ai_analysis()
                     
                     # 更新分析结果状态
-                    self.ai_status_label.setText("AI分析已停止")
-                    self.ai_status_label.setStyleSheet("color: gray; font-weight: bold;")
+                    self._set("ai_status", self.ai_status_label, "AI分析已停止", _STATE_OFF)
             
             if self.camera_controller.is_connected:
                 # 如果摄像头正在运行，先停止
@@ -494,63 +739,63 @@ class MainWindow(QtWidgets.QMainWindow):
             
             if device_index == -1:
                 # 自动检测模式
-                print("切换到自动检测模式")
+                self.log.info("切换到自动检测模式")
             else:
                 # 指定设备模式
-                print(f"选择摄像头设备: {device_index}")
+                self.log.info(f"选择摄像头设备: {device_index}")
                 
                 # 重新初始化控制器
                 success = self.camera_controller.initialize(
                     camera_index=device_index, 
                     resolution=(640, 480), 
-                    fps=15
+                    fps=15,
+                    buffer_size=1
                 )
                 
                 if success:
-                    self.camera_status.setText("摄像头设备已切换")
-                    self.camera_status.setStyleSheet("color: green; font-weight: bold;")
+                    self._set_camera_status("摄像头设备已切换")
+                    _set_state(self.camera_status, _STATE_OK)
                     
                     # 重新设置分析结果回调
-                    self.camera_controller.set_analysis_callback(self._on_analysis_result)
+                    self.camera_controller.set_analysis_callback(self._ai_callback)
                     
                     # 如果之前启用了AI分析，重新启用
                     if ai_was_enabled:
-                        print("[设备切换] 重新启用AI分析...")
+                        self.log.info("[设备切换] 重新启用AI分析...")
                         # 使用默认模型路径重新启用AI分析
                         ai_success = self.camera_controller.enable_ai_analysis("models/yolov5s.onnx")
                         if ai_success:
-                            print("[设备切换] ✓ AI分析重新启用成功")
+                            self.log.info("[设备切换] ✓ AI分析重新启用成功")
                             self.ai_analysis_btn.setText("AI分析: 开启")
-                            self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; }")
+                            _set_state(self.ai_analysis_btn, _STATE_BTN_START)
                             
                             # 更新分析结果状态
-                            self.ai_status_label.setText("AI分析运行中...")
-                            self.ai_status_label.setStyleSheet("color: green; font-weight: bold;")
-                            self.ai_results_text.setPlainText("等待AI分析结果...")
+                            self._set("ai_status", self.ai_status_label, "AI分析运行中...", _STATE_OK)
+                            self._set_ai_text("等待AI分析结果...")
                         else:
-                            print("[设备切换] ✗ AI分析重新启用失败")
+                            self.log.warning("[设备切换] ✗ AI分析重新启用失败")
                             self.ai_analysis_btn.setText("AI分析: 关闭")
-                            self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; }")
+                            _set_state(self.ai_analysis_btn, _STATE_BTN_STOP)
                     
                     # 更新显示控件
                     self._update_camera_display()
                 else:
-                    self.camera_status.setText("设备切换失败")
-                    self.camera_status.setStyleSheet("color: red; font-weight: bold;")
+                    self._set_camera_status("设备切换失败")
+                    _set_state(self.camera_status, _STATE_ERR)
                 
                 # 3秒后恢复状态
-                QtCore.QTimer.singleShot(3000, lambda: self.camera_status.setText("摄像头未启动"))
+                self._restore_camera_status_later("摄像头未启动")
                 
         except Exception as e:
-            print(f"切换摄像头设备错误: {e}")
+            self.log.error(f"切换摄像头设备错误: {e}", exc_info=True)
     
     def _start_camera(self):
         """启动摄像头"""
         try:
             success = self.camera_controller.start_camera()
             if success:
-                self.camera_status.setText("摄像头运行中")
-                self.camera_status.setStyleSheet("color: green; font-weight: bold;")
+                self._set_camera_status("摄像头运行中")
+                _set_state(self.camera_status, _STATE_OK)
                 self.camera_start_btn.setEnabled(False)
                 self.camera_stop_btn.setEnabled(True)
                 self.camera_capture_btn.setEnabled(True)
@@ -560,176 +805,230 @@ class MainWindow(QtWidgets.QMainWindow):
                 # 如果AI功能已启用，更新按钮状态
                 if hasattr(self.camera_controller, 'ai_enabled') and self.camera_controller.ai_enabled:
                     self.ai_analysis_btn.setText("AI分析: 开启")
-                    self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; }")
+                    _set_state(self.ai_analysis_btn, _STATE_BTN_START)
                 else:
                     self.ai_analysis_btn.setText("AI分析: 关闭")
-                    self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; }")
+                    _set_state(self.ai_analysis_btn, _STATE_BTN_STOP)
                 
-                print("摄像头启动成功")
+                self.log.info("摄像头启动成功")
             else:
-                self.camera_status.setText("摄像头启动失败")
-                self.camera_status.setStyleSheet("color: red; font-weight: bold;")
-                print("摄像头启动失败")
+                self._set_camera_status("摄像头启动失败")
+                _set_state(self.camera_status, _STATE_ERR)
+                self.log.warning("摄像头启动失败")
         except Exception as e:
-            print(f"启动摄像头错误: {e}")
+            self.log.error(f"启动摄像头错误: {e}", exc_info=True)
     
     def _stop_camera(self):
         """停止摄像头"""
         try:
             self.camera_controller.stop_camera()
-            self.camera_status.setText("摄像头已停止")
-            self.camera_status.setStyleSheet("color: gray; font-weight: bold;")
+            self._set_camera_status("摄像头已停止")
+            _set_state(self.camera_status, _STATE_OFF)
             self.camera_start_btn.setEnabled(True)
             self.camera_stop_btn.setEnabled(False)
             self.camera_capture_btn.setEnabled(False)
             self.camera_rotate_btn.setEnabled(False)
             self.ai_analysis_btn.setEnabled(False)
-            print("摄像头已停止")
+            self.log.info("摄像头已停止")
         except Exception as e:
-            print(f"停止摄像头错误: {e}")
+            self.log.error(f"停止摄像头错误: {e}", exc_info=True)
     
     def _rotate_camera(self):
         """旋转摄像头画面"""
         try:
-            # 每次点击向右旋转90度
-            self.camera_controller.rotate_camera(90)
+            # 每次点击向右旋转90度，返回值即当前角度
+            rotation_angle = self.camera_controller.rotate_camera(90)
             
             # 更新按钮文本显示当前角度
-            rotation_angle = 0
-            if hasattr(self.camera_controller.camera_widget, 'get_rotation_angle'):
-                rotation_angle = self.camera_controller.camera_widget.get_rotation_angle()
-            
             self.camera_rotate_btn.setText(f"旋转{rotation_angle}°")
-            self.camera_status.setText(f"画面已旋转至{rotation_angle}度")
+            self._set_camera_status(f"画面已旋转至{rotation_angle}度")
             
             # 3秒后恢复状态显示
-            QtCore.QTimer.singleShot(3000, lambda: self.camera_status.setText("摄像头运行中"))
+            self._restore_camera_status_later("摄像头运行中")
             
         except Exception as e:
-            print(f"旋转摄像头错误: {e}")
+            self.log.error(f"旋转摄像头错误: {e}", exc_info=True)
     
     def _capture_image(self):
         """拍照保存"""
         try:
-            import os
             from datetime import datetime
             
-            # 创建captures目录
-            captures_dir = "data/captures"
-            os.makedirs(captures_dir, exist_ok=True)
-            
             # 生成文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            captures_dir = "data/captures"
+            # 带毫秒，同一秒内连续拍照排队写盘时不会互相覆盖
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
             filename = f"capture_{timestamp}.jpg"
             file_path = os.path.join(captures_dir, filename)
             
-            # 拍照保存
-            success = self.camera_controller.capture_image(file_path)
-            
-            if success:
-                self.camera_status.setText(f"照片已保存: {filename}")
-                print(f"照片已保存: {file_path}")
-                
-                # 3秒后恢复状态显示
-                QtCore.QTimer.singleShot(3000, lambda: self.camera_status.setText("摄像头运行中"))
-            else:
-                self.camera_status.setText("拍照失败")
-                print("拍照失败")
+            # 创建目录和写盘放到线程池，慢速存储不阻塞界面
+            QtCore.QThreadPool.globalInstance().start(_SaveJob(self.camera_controller, file_path, self.capture_done))
                 
         except Exception as e:
-            print(f"拍照错误: {e}")
+            self.log.error(f"拍照错误: {e}", exc_info=True)
+    
+    def _on_capture_done(self, file_path: str, success: bool) -> None:
+        """拍照保存完成（界面线程）"""
+        if success:
+            self._set_camera_status(f"照片已保存: {os.path.basename(file_path)}")
+            self.log.info(f"照片已保存: {file_path}")
+            
+            # 3秒后恢复状态显示
+            self._restore_camera_status_later("摄像头运行中")
+        else:
+            self._set_camera_status("拍照失败")
+            self.log.warning("拍照失败")
+    
+    def _set_camera_status(self, text: str) -> None:
+        """设置摄像头状态文本，并使之前安排的延时恢复失效"""
+        self._status_gen += 1
+        self.camera_status.setText(text)
+    
+    def _restore_camera_status_later(self, text: str, delay_ms: int = 3000) -> None:
+        """延时恢复摄像头状态文本（期间若状态被再次设置则不恢复）"""
+        QtCore.QTimer.singleShot(delay_ms, functools.partial(self._restore_status, self._status_gen, text))
+    
+    def _restore_status(self, gen: int, text: str) -> None:
+        if gen != self._status_gen:
+            return
+        self._set_camera_status(text)
     
     def _on_camera_frame(self, frame):
-        """摄像头帧回调函数（用于WebSocket发送等）"""
-        # 这里可以添加WebSocket发送逻辑
-        # 例如：self._send_frame_via_websocket(frame)
+        """摄像头帧回调函数（在采集线程执行，用于WebSocket发送等）"""
+        # 目前没有下游处理，画面显示由摄像头控制器在界面线程完成。
+        # 接入耗时处理（例如：self._send_frame_via_websocket(frame)）时，
+        # 用 FrameRing 把帧交给独立的消费线程，不要阻塞采集线程
         pass
     
     def _toggle_ai_analysis(self):
         """切换AI分析功能"""
         try:
             if not hasattr(self.camera_controller, 'ai_enabled'):
-                print("当前摄像头控制器不支持AI分析功能")
+                self.log.warning("当前摄像头控制器不支持AI分析功能")
                 return
             
             if self.camera_controller.ai_enabled:
                 # 关闭AI分析
                 self.camera_controller.disable_ai_analysis()
                 self.ai_analysis_btn.setText("AI分析: 关闭")
-                self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; }")
-                self.camera_status.setText("AI分析已关闭")
+                _set_state(self.ai_analysis_btn, _STATE_BTN_STOP)
+                self._set_camera_status("AI分析已关闭")
                 
                 # 更新分析结果状态
-                self.ai_status_label.setText("AI分析已关闭")
-                self.ai_status_label.setStyleSheet("color: gray; font-weight: bold;")
-                self.ai_results_text.setPlainText("AI分析功能已关闭")
+                self._set("ai_status", self.ai_status_label, "AI分析已关闭", _STATE_OFF)
+                self._set_ai_text("AI分析功能已关闭")
                 
-                print("AI分析功能已关闭")
+                self.log.info("AI分析功能已关闭")
             else:
                 # 启用AI分析
                 self.camera_controller.enable_ai_analysis()
                 self.ai_analysis_btn.setText("AI分析: 开启")
-                self.ai_analysis_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; }")
-                self.camera_status.setText("AI分析已开启")
+                _set_state(self.ai_analysis_btn, _STATE_BTN_START)
+                self._set_camera_status("AI分析已开启")
                 
                 # 更新分析结果状态
-                self.ai_status_label.setText("AI分析运行中...")
-                self.ai_status_label.setStyleSheet("color: green; font-weight: bold;")
-                self.ai_results_text.setPlainText("等待AI分析结果...")
+                self._set("ai_status", self.ai_status_label, "AI分析运行中...", _STATE_OK)
+                self._set_ai_text("等待AI分析结果...")
                 
-                print("AI分析功能已开启")
+                self.log.info("AI分析功能已开启")
             
             # 3秒后恢复状态显示
-            QtCore.QTimer.singleShot(3000, lambda: self.camera_status.setText("摄像头运行中"))
+            self._restore_camera_status_later("摄像头运行中")
             
         except Exception as e:
-            print(f"切换AI分析功能错误: {e}")
-            self.camera_status.setText(f"AI分析错误: {e}")
+            self.log.error(f"切换AI分析功能错误: {e}", exc_info=True)
+            self._set_camera_status(f"AI分析错误: {e}")
     
+    @staticmethod
+    def _weak_callback(method: Callable) -> Callable:
+        """包装绑定方法为弱引用回调，对象已销毁时调用为空操作"""
+        ref = weakref.WeakMethod(method)
+
+        def callback(*args):
+            target = ref()
+            if target is not None:
+                target(*args)
+        return callback
+
     def _on_analysis_result(self, analysis_result: dict):
-        """AI分析结果回调函数"""
+        """AI分析结果回调函数：覆盖待显示结果，由界面线程只渲染最新一条"""
+        # 槽为空时才投递一次刷新事件，结果再快也不会堆积界面事件
+        with self._pending_ai_lock:
+            had_pending = self._pending_ai_result is not None
+            self._pending_ai_result = analysis_result
+        if not had_pending:
+            self.ai_result_pending.emit()
+    
+    def _drain_ai(self) -> None:
+        """取出最新的 AI 分析结果并显示（界面线程）"""
+        with self._pending_ai_lock:
+            analysis_result = self._pending_ai_result
+            self._pending_ai_result = None
+        if analysis_result is not None:
+            self._render_ai_result(analysis_result)
+    
+    def _set_ai_text(self, text: str) -> None:
+        """设置AI结果文本（内容相同则不重排文档）；结果指纹随之失效"""
+        self._ai_fp = None
+        self._ensure_ai_widgets()
+        if text != self._ai_text:
+            self._ai_text = text
+            self.ai_results_text.setPlainText(text)
+    
+    def _render_ai_result(self, analysis_result: dict) -> None:
+        """显示一条 AI 分析结果"""
         try:
-            # 更新分析结果状态
-            self.ai_status_label.setText("AI分析运行中")
-            self.ai_status_label.setStyleSheet("color: green; font-weight: bold;")
+            self._ensure_ai_widgets()
+            _set = self._set
+            _set("ai_status", self.ai_status_label, "AI分析运行中", _STATE_OK)
             
             # 提取分析结果
             detection_result = analysis_result.get('detection_result', None)
             statistics = analysis_result.get('statistics', {})
             performance = analysis_result.get('performance', {})
             
-            # 构建结果文本
-            result_text = []
-            result_text.append("=== AI分析结果 ===")
-            
-            if detection_result:
-                result_text.append(f"👥 检测人数: {detection_result.person_count}")
-                result_text.append(f"📏 检测框数: {len(detection_result.detections)}")
-                if detection_result.detections:
-                    confidences = [f"{d[4]:.2f}" for d in detection_result.detections]
-                    result_text.append(f"🎯 置信度: {', '.join(confidences)}")
-            
-            if statistics:
-                result_text.append(f"📊 当前人数: {getattr(statistics, 'current_count', 0)}")
-                result_text.append(f"📈 平均人数: {getattr(statistics, 'avg_count', 0):.1f}")
-                result_text.append(f"📈 趋势: {getattr(statistics, 'trend', '未知')}")
-            
+            # 性能数据每次都会变化，只显示在下方标签中
             if performance:
-                result_text.append(f"⚡ 分析FPS: {performance.get('analysis_fps', 0):.1f}")
-                result_text.append(f"⏱️ 延迟: {performance.get('avg_analysis_time_ms', 0):.1f}ms")
-                result_text.append(f"🔄 总分析次数: {performance.get('total_analyses', 0)}")
+                _set("ai_fps", self.fps_label, f"FPS: {performance.get('analysis_fps', 0):.1f}")
+                _set("ai_latency", self.latency_label, f"延迟: {performance.get('avg_analysis_time_ms', 0):.1f}ms")
+                _set("ai_count", self.analysis_count_label, f"分析次数: {performance.get('total_analyses', 0)}")
             
-            # 更新分析结果文本框
-            self.ai_results_text.setPlainText('\n'.join(result_text))
+            # 检测和统计结果相同（静止场景常见）时跳过格式化和文档重排
+            detections = detection_result.detections if detection_result else ()
+            fp = (
+                detection_result.person_count if detection_result else -1,
+                tuple(round(d[4], 2) for d in detections),
+                getattr(statistics, 'current_count', 0) if statistics else None,
+                round(getattr(statistics, 'avg_count', 0), 1) if statistics else None,
+                getattr(statistics, 'trend', '未知') if statistics else None,
+            )
+            if fp == self._ai_fp:
+                return
             
-            # 更新性能统计标签
-            self.fps_label.setText(f"FPS: {performance.get('analysis_fps', 0):.1f}")
-            self.latency_label.setText(f"延迟: {performance.get('avg_analysis_time_ms', 0):.1f}ms")
-            self.analysis_count_label.setText(f"分析次数: {performance.get('total_analyses', 0)}")
+            # 构建结果文本（指纹中已有置信度和统计值，直接复用）
+            fields = {
+                'pc': fp[0], 'dc': len(detections),
+                'cs': ', '.join(f"{c:.2f}" for c in fp[1]),
+                'cur': fp[2], 'avg': fp[3], 'tr': fp[4],
+            }
+            if detections and statistics:
+                text = _AI_FULL_TEMPLATE.format_map(fields)
+            else:
+                # 结果不完整时按段拼接
+                parts = [_AI_HEADER]
+                if detection_result:
+                    parts.append(_AI_DETECTION_TEMPLATE.format_map(fields))
+                    if detections:
+                        parts.append(_AI_CONFIDENCE_TEMPLATE.format_map(fields))
+                if statistics:
+                    parts.append(_AI_STATISTICS_TEMPLATE.format_map(fields))
+                text = '\n'.join(parts)
+            self._set_ai_text(text)
+            self._ai_fp = fp
             
         except Exception as e:
-            print(f"更新AI分析结果时出错: {e}")
-            self.ai_results_text.setPlainText(f"更新结果时出错: {e}")
+            self.log.error(f"更新AI分析结果时出错: {e}", exc_info=True)
+            self._set_ai_text(f"更新结果时出错: {e}")
     
     def update_ai_analysis_result(self, analysis_info: dict):
         """更新AI分析结果显示（兼容性方法，实际使用_on_analysis_result）"""
@@ -737,23 +1036,61 @@ class MainWindow(QtWidgets.QMainWindow):
             # 直接调用新的回调方法
             self._on_analysis_result(analysis_info)
         except Exception as e:
-            print(f"更新AI分析结果显示错误: {e}")
-            self.ai_results_text.setPlainText(f"更新显示错误: {e}")
+            self.log.error(f"更新AI分析结果显示错误: {e}", exc_info=True)
+            self._set_ai_text(f"更新显示错误: {e}")
+
+    def _resume_timers(self) -> None:
+        """恢复定时刷新，并立即补上暂停期间错过的更新"""
+        for timer in self._timers:
+            timer.start()
+        self.refresh()
+        # 预览可见，恢复按采集帧率解码
+        self.camera_controller.set_retrieve_fps(None)
+
+    def _pause_timers(self) -> None:
+        """暂停定时刷新（窗口隐藏或最小化时不再定时唤醒）"""
+        for timer in self._timers:
+            timer.stop()
+        # 预览不可见时没有帧消费者（AI 分析除外），降低解码频率
+        if not self.camera_controller.ai_enabled:
+            self.camera_controller.set_retrieve_fps(_HIDDEN_RETRIEVE_FPS)
+
+    def showEvent(self, event):
+        """窗口显示事件：通知播放器界面已就绪"""
+        super().showEvent(event)
+        self.player.ui_ready()
+        if not self.isMinimized():
+            self._resume_timers()
+
+    def hideEvent(self, event):
+        """窗口隐藏事件：暂停定时刷新"""
+        super().hideEvent(event)
+        self._pause_timers()
+
+    def changeEvent(self, event):
+        """最小化时暂停定时刷新，还原后恢复"""
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange and self.isVisible():
+            if self.isMinimized():
+                self._pause_timers()
+            else:
+                self._resume_timers()
 
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 停止摄像头
+        # 停止摄像头（先摘除分析回调，停止过程中不再回调到窗口）
         try:
             if hasattr(self, 'camera_controller'):
+                self.camera_controller.set_analysis_callback(None)
                 self.camera_controller.stop_camera()
         except Exception as e:
-            print(f"关闭摄像头错误: {e}")
+            self.log.error(f"关闭摄像头错误: {e}", exc_info=True)
         
         # 停止MPV广告
         try:
             if hasattr(self, 'player'):
                 self.player.stop_ad_overlay()
         except Exception as e:
-            print(f"停止MPV广告错误: {e}")
+            self.log.error(f"停止MPV广告错误: {e}", exc_info=True)
         
         event.accept()
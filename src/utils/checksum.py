@@ -1,17 +1,77 @@
 import hashlib
+import hmac
 from pathlib import Path
+from typing import Callable, Dict, Optional
 
+# 常用算法直接映射到构造函数，省去 hashlib.new 按名字查找；其余名字仍交给 hashlib
+_HASH_CTORS: Dict[str, Callable] = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+}
 
-def calc_checksum(path: Path, algo: str = "md5", chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.new(algo)
+# 可选的高速校验算法（非安全用途的完整性校验）；未安装时对应算法不可用，md5/sha 系列不受影响
+try:
+    import blake3 as _blake3
+    _HASH_CTORS["blake3"] = lambda: _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+except ImportError:
+    pass
+try:
+    import xxhash as _xxhash
+    _HASH_CTORS["xxh64"] = _xxhash.xxh64
+    _HASH_CTORS["xxh3_64"] = _xxhash.xxh3_64
+    _HASH_CTORS["xxh3_128"] = _xxhash.xxh3_128
+except ImportError:
+    pass
+
+
+def _hash_file(path: Path, algo: str, chunk_size: int):
+    """计算文件摘要，返回哈希对象"""
+    algo = algo.lower()
+    digest = _HASH_CTORS.get(algo, algo)
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        # Python 3.11+：由 C 实现直接读文件并计算摘要，计算期间释放 GIL
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, digest)
+        # 旧版本：复用同一块缓冲区 readinto，不为每个分块新建 bytes
+        h = digest() if callable(digest) else hashlib.new(digest)
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h
 
 
-def verify_checksum(path: Path, expected: str, algo: str = "md5") -> bool:
+def calc_checksum(path: Path, algo: str = "md5", chunk_size: int = 1024 * 1024) -> str:
+    return _hash_file(path, algo, chunk_size).hexdigest()
+
+
+def verify_checksum(path: Path, expected: str, algo: str = "md5", expected_size: Optional[int] = None) -> bool:
+    # 已知文件大小时先比较大小，大小不符（如下载被截断）就不必再读完整个文件计算摘要；
+    # 没有期望摘要时只按大小判断
+    if expected_size is not None:
+        try:
+            if path.stat().st_size != expected_size:
+                return False
+        except FileNotFoundError:
+            return False
+        if not expected:
+            return True
+    # 没有期望值时无从比较，不必读取文件
+    if not expected:
+        return False
+    # 期望值转成字节后与原始摘要做常量时间比较，不必再转十六进制和大小写
+    try:
+        expected_bytes = bytes.fromhex(expected.strip())
+    except ValueError:
+        return False
     try:
-        return calc_checksum(path, algo).lower() == expected.lower()
+        return hmac.compare_digest(_hash_file(path, algo, 1024 * 1024).digest(), expected_bytes)
     except FileNotFoundError:
         return False
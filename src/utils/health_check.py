@@ -1,21 +1,43 @@
 """
 健康检查模块，用于监控各组件状态并自动恢复
 """
+import functools
+import heapq
+import itertools
+import logging
 import time
 import threading
-from typing import Dict, Any, Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from ..utils.logger import get_logger
 
 
 class HealthCheck:
     """健康检查器"""
     
-    def __init__(self, check_interval: int = 30) -> None:
+    def __init__(self, check_interval: int = 30, min_interval: float = 1.0,
+                 max_workers: int = 4, check_timeout: Optional[float] = None) -> None:
         self.log = get_logger("health")
         self.check_interval = check_interval
+        # 组件失败后从此间隔开始复查，每次仍失败则翻倍，直到 check_interval
+        self.min_interval = min(min_interval, check_interval)
+        # 各组件的检查在线程池中并行执行，慢检查不会拖住其他组件；
+        # 提交后超过 check_timeout 仍未返回即由调度线程判为失败并重新排期
+        self.max_workers = max_workers
+        self.check_timeout = check_timeout if check_timeout is not None else check_interval / 2
+        self._pool: Optional[ThreadPoolExecutor] = None
         self.checks: Dict[str, Dict[str, Any]] = {}
         self._running = True
         self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()  # 停止或注册新组件时唤醒检查线程
+        # 到期堆 (下次检查时间, 序号, 组件名)；重新注册后旧条目与 next_check 不符，弹出时丢弃
+        self._due: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        # 执行中的检查：组件名 -> (Future, 截止时间, 检查信息)
+        self._inflight: Dict[str, Tuple[Future, float, Dict[str, Any]]] = {}
+        # 已判超时但仍未返回的检查；其结果到达时丢弃，期间该组件不再重复提交
+        self._stuck: Dict[str, Future] = {}
+        self._lock = threading.Lock()  # 保护 checks 的增改、到期堆和执行中的检查
     
     def register_component(self, 
                           component_name: str, 
@@ -23,29 +45,39 @@ class HealthCheck:
                           recovery_func: Optional[Callable[[], None]] = None,
                           max_failures: int = 3) -> None:
         """注册组件健康检查"""
-        self.checks[component_name] = {
-            'check_func': check_func,
-            'recovery_func': recovery_func,
-            'max_failures': max_failures,
-            'failure_count': 0,
-            'last_check': 0,
-            'healthy': True
-        }
+        now = time.monotonic()
+        with self._lock:
+            self.checks[component_name] = {
+                'check_func': check_func,
+                'recovery_func': recovery_func,
+                'max_failures': max_failures,
+                'failure_count': 0,
+                'last_check': 0,
+                'next_check': now,  # 下次检查时间（monotonic），新组件立即检查
+                'interval': self.check_interval,
+                'healthy': True
+            }
+            heapq.heappush(self._due, (now, next(self._seq), component_name))
         self.log.info(f"注册组件健康检查: {component_name}", "register_component")
+        self._wake.set()
     
     def start(self) -> None:
         """启动健康检查"""
         if self._thread and self._thread.is_alive():
             return
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health")
             
         def health_check_loop():
             while self._running:
+                timeout = self.check_interval
                 try:
-                    self._perform_checks()
+                    timeout = self._perform_checks()
                 except Exception as e:
                     self.log.error(f"健康检查异常: {e}", "health_check_loop", e)
                 
-                time.sleep(self.check_interval)
+                # 等到最早到期的组件，期间可被 stop()/register_component() 提前唤醒
+                self._wake.wait(timeout)
+                self._wake.clear()
         
         self._thread = threading.Thread(target=health_check_loop, daemon=True)
         self._thread.start()
@@ -54,61 +86,153 @@ class HealthCheck:
     def stop(self) -> None:
         """停止健康检查"""
         self._running = False
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=5)
+        if self._pool:
+            # 不等待正在执行的检查，未开始的直接取消
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
         self.log.info("健康检查已停止", "stop")
     
-    def _perform_checks(self) -> None:
-        """执行所有健康检查"""
-        current_time = time.time()
+    def _perform_checks(self) -> float:
+        """处理超时的检查并提交到期的检查，返回距下一个到期或超时时刻的秒数"""
+        now = time.monotonic()
+        self._expire_checks(now)
         
-        for component_name, check_info in self.checks.items():
-            # 避免过于频繁的检查
-            if current_time - check_info['last_check'] < self.check_interval:
+        # 只弹出已到期的组件，未到期的不遍历；执行中的组件不在堆里，不会重复提交
+        while True:
+            with self._lock:
+                if not self._due or self._due[0][0] > now:
+                    break
+                due, _, component_name = heapq.heappop(self._due)
+                check_info = self.checks.get(component_name)
+                if check_info is None or check_info['next_check'] != due:
+                    continue
+                stuck = component_name in self._stuck
+            if stuck:
+                # 上次的检查超时后仍未返回，不再占用新的工作线程，直接计为失败
+                self.log.warning(f"组件 {component_name} 上次健康检查仍未返回", "health_check_timeout")
+                self._apply_result(component_name, check_info, False)
                 continue
-                
-            check_info['last_check'] = current_time
-            
-            try:
-                is_healthy = check_info['check_func']()
-                
-                if is_healthy:
-                    if not check_info['healthy']:
-                        self.log.info(f"组件 {component_name} 已恢复健康", "health_recovered")
-                    check_info['healthy'] = True
-                    check_info['failure_count'] = 0
-                else:
-                    check_info['failure_count'] += 1
-                    check_info['healthy'] = False
-                    
-                    self.log.warning(f"组件 {component_name} 健康检查失败 ({check_info['failure_count']}/{check_info['max_failures']})", "health_check_failed")
-                    
-                    # 触发恢复机制
-                    if (check_info['failure_count'] >= check_info['max_failures'] and 
-                        check_info['recovery_func']):
-                        self.log.info(f"尝试恢复组件 {component_name}", "recovery_attempt")
-                        try:
-                            check_info['recovery_func']()
-                            check_info['failure_count'] = 0  # 重置失败计数
-                            self.log.info(f"组件 {component_name} 恢复成功", "recovery_success")
-                        except Exception as e:
-                            self.log.error(f"组件 {component_name} 恢复失败: {e}", "recovery_failed", e)
-                            
-            except Exception as e:
-                self.log.error(f"执行组件 {component_name} 健康检查时出错: {e}", "health_check_error", e)
+            pool = self._pool
+            if pool is None:
+                self._apply_result(component_name, check_info, self._run_check(component_name, check_info))
+                continue
+            future = pool.submit(self._run_check, component_name, check_info)
+            with self._lock:
+                self._inflight[component_name] = (future, now + self.check_timeout, check_info)
+            future.add_done_callback(functools.partial(self._on_check_done, component_name, check_info))
+        
+        with self._lock:
+            deadlines = [entry[1] for entry in self._inflight.values()]
+            if self._due:
+                deadlines.append(self._due[0][0])
+        if not deadlines:
+            return self.check_interval
+        return max(0.0, min(min(deadlines) - time.monotonic(), self.check_interval))
+    
+    def _expire_checks(self, now: float) -> None:
+        """把超过截止时间仍未返回的检查判为失败并重新排期（在调度线程中执行）"""
+        expired = []
+        with self._lock:
+            for component_name, (future, deadline, check_info) in list(self._inflight.items()):
+                if deadline <= now:
+                    del self._inflight[component_name]
+                    self._stuck[component_name] = future
+                    expired.append((component_name, check_info))
+        for component_name, check_info in expired:
+            self.log.warning(f"组件 {component_name} 健康检查超时 ({self.check_timeout:.1f}s)", "health_check_timeout")
+            self._apply_result(component_name, check_info, False)
+    
+    def _run_check(self, component_name: str, check_info: Dict[str, Any]) -> bool:
+        """在线程池中执行单个组件的检查函数，异常视为不健康"""
+        with self._lock:
+            check_info['last_check'] = time.time()
+        try:
+            return bool(check_info['check_func']())
+        except Exception as e:
+            self.log.error(f"执行组件 {component_name} 健康检查时出错: {e}", "health_check_error", e)
+            return False
+    
+    def _on_check_done(self, component_name: str, check_info: Dict[str, Any], future: Future) -> None:
+        """检查完成回调（在工作线程中执行）；已被判超时的检查结果直接丢弃"""
+        with self._lock:
+            entry = self._inflight.get(component_name)
+            if entry is None or entry[0] is not future:
+                if self._stuck.get(component_name) is future:
+                    del self._stuck[component_name]
+                return
+            del self._inflight[component_name]
+        if future.cancelled() or not self._running:
+            return
+        try:
+            is_healthy = future.result()
+        except Exception as e:
+            self.log.error(f"组件 {component_name} 健康检查任务异常: {e}", "health_check_error", e)
+            is_healthy = False
+        self._apply_result(component_name, check_info, is_healthy)
+    
+    def _apply_result(self, component_name: str, check_info: Dict[str, Any], is_healthy: bool) -> None:
+        """记录检查结果，必要时触发恢复，并安排下次检查
+
+        get_status() 读取的三个状态字段只在锁内修改，恢复函数本身在锁外执行。
+        """
+        was_healthy = check_info['healthy']
+        
+        if is_healthy:
+            if not was_healthy and self.log.is_enabled(logging.INFO):
+                self.log.info(f"组件 {component_name} 已恢复健康", "health_recovered")
+            with self._lock:
+                check_info['healthy'] = True
+                check_info['failure_count'] = 0
+        else:
+            with self._lock:
                 check_info['failure_count'] += 1
                 check_info['healthy'] = False
+            
+            if self.log.is_enabled(logging.WARNING):
+                self.log.warning(f"组件 {component_name} 健康检查失败 ({check_info['failure_count']}/{check_info['max_failures']})", "health_check_failed")
+            
+            # 触发恢复机制
+            if (check_info['failure_count'] >= check_info['max_failures'] and 
+                check_info['recovery_func']):
+                self.log.info(f"尝试恢复组件 {component_name}", "recovery_attempt")
+                try:
+                    check_info['recovery_func']()
+                    with self._lock:
+                        check_info['failure_count'] = 0  # 重置失败计数
+                    self.log.info(f"组件 {component_name} 恢复成功", "recovery_success")
+                except Exception as e:
+                    self.log.error(f"组件 {component_name} 恢复失败: {e}", "recovery_failed", e)
+        
+        # 健康时按常规间隔检查；异常时从短间隔开始退避复查，尽快发现恢复或触发恢复动作
+        if check_info['healthy']:
+            check_info['interval'] = self.check_interval
+        elif was_healthy:
+            check_info['interval'] = self.min_interval
+        else:
+            check_info['interval'] = min(check_info['interval'] * 2, self.check_interval)
+        check_info['next_check'] = time.monotonic() + check_info['interval']
+        
+        with self._lock:
+            # 检查期间组件可能被重新注册，此时以新条目为准
+            if self.checks.get(component_name) is check_info:
+                heapq.heappush(self._due, (check_info['next_check'], next(self._seq), component_name))
+        # 下次检查时间可能早于调度线程当前的等待期限
+        self._wake.set()
     
     def get_status(self) -> Dict[str, Dict[str, Any]]:
-        """获取所有组件状态"""
-        status = {}
-        for name, info in self.checks.items():
-            status[name] = {
-                'healthy': info['healthy'],
-                'failure_count': info['failure_count'],
-                'last_check': info['last_check']
+        """获取所有组件状态（一致的快照）"""
+        with self._lock:
+            return {
+                name: {
+                    'healthy': info['healthy'],
+                    'failure_count': info['failure_count'],
+                    'last_check': info['last_check']
+                }
+                for name, info in self.checks.items()
             }
-        return status
     
     def is_component_healthy(self, component_name: str) -> bool:
         """检查特定组件是否健康"""
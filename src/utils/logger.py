@@ -1,10 +1,124 @@
+import atexit
 import logging
+import os
+import queue
+import threading
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 from .paths import logs_dir
 
+# 后台写日志的监听器；调用线程只负责把记录放入队列
+_listener: Optional[QueueListener] = None
+
+
+class _SharedFormatter(logging.Formatter):
+    """多个处理器共用的格式化器：同一条记录只格式化一次，结果缓存在记录上"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        cached = record.__dict__.get("_shared_fmt")
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        text = super().format(record)
+        record._shared_fmt = (self, text)
+        return text
+
+
+# 控制台和文件输出共用同一个格式化器
+_FORMATTER = _SharedFormatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """带缓冲的滚动文件处理器
+
+    记录先写入文件流缓冲区，距上次刷盘超过 flush_interval 秒或遇到 ERROR 及以上级别时才刷盘；
+    空闲时由一次性定时器补刷。文件大小自行累计，不再每条记录 seek/tell（那会强制刷出缓冲区），
+    也不为计数再编码一次消息，而是按字符数乘以字节/字符比估算；累计值首次接近 maxBytes 时
+    fstat 校正一次并据此更新该比值，之后直到滚动都不再校正。
+    """
+
+    def __init__(self, filename, *args, flush_interval: float = 1.0, **kwargs) -> None:
+        super().__init__(filename, *args, **kwargs)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._size: Optional[int] = None  # 当前文件字节数（估算），打开或滚动后重新获取
+        self._synced = False  # 本文件是否已在接近上限时校正过
+        self._base = 0  # 上次校正时的真实文件大小
+        self._chars = 0  # 上次校正后写入的字符数
+        self._ratio = 2.0  # 字节/字符比，初始偏大使首次校正提前发生，之后按实测更新
+        self._flush_timer: Optional[threading.Timer] = None
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._size = None
+        self._synced = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self._size is None:
+                self.stream.flush()
+                self._size = self._base = os.fstat(self.stream.fileno()).st_size
+                self._chars = 0
+            nchars = len(msg)
+            nbytes = int(nchars * self._ratio + 0.5)
+            if self.maxBytes > 0 and not self._synced and self._size + nbytes >= self.maxBytes * 0.9:
+                # 首次接近上限时用真实文件大小校正一次（文件可能被外部截断或追加），并更新字节/字符比
+                self.stream.flush()
+                self._last_flush = time.monotonic()
+                size = os.fstat(self.stream.fileno()).st_size
+                if self._chars:
+                    self._ratio = min(max((size - self._base) / self._chars, 1.0), 4.0)
+                    nbytes = int(nchars * self._ratio + 0.5)
+                self._size = size
+                self._synced = True
+            if self.maxBytes > 0 and self._size > 0 and self._size + nbytes >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                self._size = self._base = self._chars = 0
+            self.stream.write(msg)
+            self._size += nbytes
+            self._chars += nchars
+
+            now = time.monotonic()
+            if record.levelno >= logging.ERROR or now - self._last_flush >= self.flush_interval:
+                self.stream.flush()
+                self._last_flush = now
+            elif self._flush_timer is None:
+                # 保证一段突发日志之后的最后几条也能在 flush_interval 内落盘
+                self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _timed_flush(self) -> None:
+        """定时器线程中补刷缓冲区"""
+        self.acquire()
+        try:
+            self._flush_timer = None
+            if self.stream is not None:
+                self.stream.flush()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        finally:
+            self.release()
+        super().close()
+
 
 class ComponentLogger:
     """组件专用日志器，提供结构化日志记录"""
@@ -12,43 +126,47 @@ class ComponentLogger:
     def __init__(self, name: str, component: str) -> None:
         self.logger = logging.getLogger(name)
         self.component = component
+        self._prefix = f"[{component}] "  # 每条消息共用的前缀，只拼接一次
         self.operation_start_time: Optional[float] = None
     
+    def is_enabled(self, level: int) -> bool:
+        """该级别的日志是否会输出；用于在拼接消息前跳过关闭的级别"""
+        return self.logger.isEnabledFor(level)
+    
+    def _format(self, message: str, operation: Optional[str]) -> str:
+        """拼接组件前缀和操作名"""
+        if operation:
+            return f"{self._prefix}{operation}: {message}"
+        return self._prefix + message
+    
     def info(self, message: str, operation: Optional[str] = None) -> None:
         """信息日志"""
-        if operation:
-            message = f"[{self.component}] {operation}: {message}"
-        else:
-            message = f"[{self.component}] {message}"
-        self.logger.info(message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(self._format(message, operation))
     
-    def error(self, message: str, operation: Optional[str] = None, error: Optional[Exception] = None) -> None:
-        """错误日志"""
-        if operation:
-            message = f"[{self.component}] {operation}: {message}"
-        else:
-            message = f"[{self.component}] {message}"
-        
+    def error(self, message: str, operation: Optional[str] = None, error: Optional[Exception] = None,
+              exc_info: bool = False) -> None:
+        """错误日志；exc_info=True 时附带当前异常的堆栈
+
+        注意：QueueHandler 入队前会在调用线程中把堆栈格式化成文本，只有写终端和文件在日志线程完成，
+        高频路径上不要使用 exc_info。
+        """
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        message = self._format(message, operation)
         if error:
             message = f"{message} - 错误: {error}"
-        
-        self.logger.error(message)
+        self.logger.error(message, exc_info=exc_info)
     
     def warning(self, message: str, operation: Optional[str] = None) -> None:
         """警告日志"""
-        if operation:
-            message = f"[{self.component}] {operation}: {message}"
-        else:
-            message = f"[{self.component}] {message}"
-        self.logger.warning(message)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(self._format(message, operation))
     
     def debug(self, message: str, operation: Optional[str] = None) -> None:
         """调试日志"""
-        if operation:
-            message = f"[{self.component}] {operation}: {message}"
-        else:
-            message = f"[{self.component}] {message}"
-        self.logger.debug(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self._format(message, operation))
     
     def start_operation(self, operation: str) -> None:
         """开始操作计时"""
@@ -65,31 +183,59 @@ class ComponentLogger:
 
 
 def setup_logging(level: str = "INFO", name: str = "mpvPlayer", max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3) -> ComponentLogger:
-    """设置日志配置并返回应用级日志器"""
+    """设置日志配置并返回应用级日志器
+
+    根日志器只挂一个 QueueHandler，控制台和文件输出由后台 QueueListener 线程完成，
+    界面线程和采集/分析线程写日志时不会阻塞在终端或磁盘 I/O 上。
+    """
+    global _listener
     log_level = getattr(logging, level.upper(), logging.INFO)
     logger = logging.getLogger()
     logger.setLevel(log_level)
 
-    # 清除现有处理器
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
+    # 清除现有处理器（先关闭，释放文件句柄），重复调用时再停止旧的监听器
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
     # Console handler
     ch = logging.StreamHandler()
     ch.setLevel(log_level)
-    ch.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
-    logger.addHandler(ch)
+    ch.setFormatter(_FORMATTER)
 
     # File handler
     log_file: Path = logs_dir() / f"{name}.log"
-    fh = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    fh = BufferedRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
     fh.setLevel(log_level)
-    fh.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
-    logger.addHandler(fh)
+    fh.setFormatter(_FORMATTER)
+
+    # 异步输出：记录经无界队列交给监听线程，再分发到控制台和文件
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    _listener.start()
     
     return ComponentLogger("app", "Application")
 
 
+def _stop_listener() -> None:
+    """进程退出前输出队列中剩余的日志，并把文件缓冲区刷盘"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> ComponentLogger:
     """获取指定名称的组件日志器"""
     component_name = name.split('.')[-1] if '.' in name else name
@@ -1,12 +1,16 @@
+import functools
 import os
 from pathlib import Path
 from typing import Optional
 
 
+# 以下目录在进程内不变：首次调用时解析路径并创建目录，之后直接返回缓存结果
+@functools.lru_cache(maxsize=None)
 def project_root() -> Path:
     return Path(__file__).resolve().parent.parent.parent
 
 
+@functools.lru_cache(maxsize=None)
 def data_dir() -> Path:
     root = project_root()
     dir_path = root / "data"
@@ -18,16 +22,25 @@ def config_path() -> Path:
     return data_dir() / "config.json"
 
 
+@functools.lru_cache(maxsize=None)
 def logs_dir() -> Path:
     path = data_dir() / "logs"
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-def downloads_dir(default: Optional[str] = None) -> Path:
-    if default:
-        path = Path(default)
-    else:
-        path = data_dir() / "downloads"
+@functools.lru_cache(maxsize=None)
+def _default_downloads_dir() -> Path:
+    path = data_dir() / "downloads"
     path.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def downloads_dir(default: Optional[str] = None) -> Path:
+    if not default:
+        return _default_downloads_dir()
+    path = Path(default)
+    # 目录已存在时省去 mkdir
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -6,11 +6,30 @@
 
 import sys
 import os
-import cv2
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加项目路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# cv2、PySide6 等重量级模块只在用到它们的测试函数内导入，只跑部分测试时不必全部加载
+
+def _probe_camera(i):
+    """探测单个摄像头索引，返回 (索引, 结果说明, 是否可用)"""
+    import cv2
+    try:
+        cap = cv2.VideoCapture(i)
+        try:
+            if not cap.isOpened():
+                return i, f"✗ 摄像头 {i} 不可用", False
+            # 抓取一帧（不解码）确认设备确实在出画面
+            if cap.grab():
+                return i, f"✓ 检测到摄像头 {i}", True
+            return i, f"✗ 摄像头 {i} 可打开但无法读取画面", False
+        finally:
+            cap.release()
+    except Exception as e:
+        return i, f"✗ 检测摄像头 {i} 时出错: {e}", False
+
 def test_camera_detection():
     """测试摄像头检测功能"""
     print("=== 摄像头检测测试 ===")
@@ -23,19 +42,14 @@ def test_camera_detection():
         print(f"✗ OpenCV导入失败: {e}")
         return False
     
-    # 检测可用摄像头
+    # 并行检测可用摄像头，按索引顺序输出
     available_cameras = []
-    for i in range(5):
-        try:
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_cameras.append(i)
-                print(f"✓ 检测到摄像头 {i}")
-            else:
-                print(f"✗ 摄像头 {i} 不可用")
-            cap.release()
-        except Exception as e:
-            print(f"✗ 检测摄像头 {i} 时出错: {e}")
+    with ThreadPoolExecutor(max_workers=5) as ex:
+        results = list(ex.map(_probe_camera, range(5)))
+    for i, message, ok in results:
+        print(message)
+        if ok:
+            available_cameras.append(i)
     
     if available_cameras:
         print(f"\n✓ 找到 {len(available_cameras)} 个可用摄像头: {available_cameras}")
@@ -5,29 +5,41 @@
 import cv2
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# OpenCV 4.5 起提供非阻塞的 pollKey，旧版本退回 waitKey(1)
+_poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+def _probe_camera(i):
+    """探测单个摄像头索引，返回 (索引, 结果说明, 是否可用)"""
+    try:
+        cap = cv2.VideoCapture(i)
+        try:
+            if not cap.isOpened():
+                return i, f"✗ 摄像头 {i} 不可用", False
+            # 只抓取一帧验证设备在出画面，不解码；分辨率从属性读取
+            if cap.grab():
+                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                return i, f"✓ 摄像头 {i} 可用 - 分辨率: {width}x{height}", True
+            return i, f"✗ 摄像头 {i} 可打开但无法读取画面", False
+        finally:
+            cap.release()
+    except Exception as e:
+        return i, f"✗ 检测摄像头 {i} 时出错: {e}", False
 
 def list_available_cameras():
     """列出所有可用的摄像头设备"""
     print("=== 摄像头设备检测 ===")
     available_cameras = []
     
-    # 检查前10个摄像头索引
-    for i in range(10):
-        try:
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                # 尝试读取一帧验证
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    available_cameras.append(i)
-                    print(f"✓ 摄像头 {i} 可用 - 分辨率: {frame.shape[1]}x{frame.shape[0]}")
-                else:
-                    print(f"✗ 摄像头 {i} 可打开但无法读取画面")
-            else:
-                print(f"✗ 摄像头 {i} 不可用")
-            cap.release()
-        except Exception as e:
-            print(f"✗ 检测摄像头 {i} 时出错: {e}")
+    # 并行检查前10个摄像头索引（打开/读取时 OpenCV 释放 GIL），按索引顺序输出
+    with ThreadPoolExecutor(max_workers=10) as ex:
+        results = list(ex.map(_probe_camera, range(10)))
+    for i, message, ok in results:
+        print(message)
+        if ok:
+            available_cameras.append(i)
     
     print(f"\n总计找到 {len(available_cameras)} 个可用摄像头: {available_cameras}")
     return available_cameras
@@ -73,8 +85,9 @@ def preview_camera(camera_index, duration=10):
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
     
-    start_time = time.time()
+    start_time = time.monotonic()
     frame_count = 0
+    fps_text = "FPS: --"
     
     print("按 'q' 键退出预览，按 's' 键保存当前帧")
     
@@ -85,18 +98,20 @@ def preview_camera(camera_index, duration=10):
             break
         
         frame_count += 1
+        now = time.monotonic()
+        elapsed = now - start_time
+        
+        # 帧率每 10 帧计算一次，叠加在画面上后再显示
+        if frame_count % 10 == 0 and elapsed > 0:
+            fps_text = f'FPS: {frame_count / elapsed:.1f}'
+        cv2.putText(frame, fps_text, (10, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
         
         # 显示画面
         cv2.imshow(f'Camera {camera_index} Preview', frame)
         
-        # 计算并显示帧率
-        elapsed = time.time() - start_time
-        fps = frame_count / elapsed if elapsed > 0 else 0
-        cv2.putText(frame, f'FPS: {fps:.1f}', (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # 按键处理
-        key = cv2.waitKey(1) & 0xFF
+        # 按键处理：pollKey 只处理窗口事件不休眠，waitKey(1) 在部分后端每帧至少睡 1ms
+        key = _poll_key() & 0xFF
         if key == ord('q'):
             break
         elif key == ord('s'):
@@ -107,38 +122,47 @@ def preview_camera(camera_index, duration=10):
             print(f"截图已保存: {filename}")
         
         # 超时退出
-        if time.time() - start_time > duration:
+        if elapsed > duration:
             break
     
     cap.release()
     cv2.destroyAllWindows()
     
-    actual_fps = frame_count / (time.time() - start_time) if (time.time() - start_time) > 0 else 0
+    elapsed = time.monotonic() - start_time
+    actual_fps = frame_count / elapsed if elapsed > 0 else 0
     print(f"实际帧率: {actual_fps:.1f} FPS")
 
 def test_backends(camera_index):
     """测试不同的OpenCV后端"""
     print(f"\n=== 测试摄像头 {camera_index} 不同后端 ===")
     
+    # (后端, 名称, 仅在哪个平台可用)；其他平台上打开必然失败，直接跳过
     backends = [
-        (cv2.CAP_V4L2, "V4L2"),
-        (cv2.CAP_ANY, "ANY"),
-        (cv2.CAP_FFMPEG, "FFMPEG"),
-        (cv2.CAP_GSTREAMER, "GSTREAMER")
+        (cv2.CAP_V4L2, "V4L2", "linux"),
+        (cv2.CAP_DSHOW, "DSHOW", "win"),
+        (cv2.CAP_MSMF, "MSMF", "win"),
+        (cv2.CAP_ANY, "ANY", None),
+        (cv2.CAP_FFMPEG, "FFMPEG", None),
+        (cv2.CAP_GSTREAMER, "GSTREAMER", None)
     ]
     
-    for backend, name in backends:
+    for backend, name, platform in backends:
+        if platform and not sys.platform.startswith(platform):
+            continue
         try:
             cap = cv2.VideoCapture(camera_index, backend)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret:
-                    print(f"✓ {name} 后端: 可用 - 分辨率: {frame.shape[1]}x{frame.shape[0]}")
+            try:
+                if cap.isOpened():
+                    if cap.grab():
+                        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                        print(f"✓ {name} 后端: 可用 - 分辨率: {width}x{height}")
+                    else:
+                        print(f"✗ {name} 后端: 可打开但无法读取")
                 else:
-                    print(f"✗ {name} 后端: 可打开但无法读取")
-            else:
-                print(f"✗ {name} 后端: 不可用")
-            cap.release()
+                    print(f"✗ {name} 后端: 不可用")
+            finally:
+                cap.release()
         except Exception as e:
             print(f"✗ {name} 后端: 错误 - {e}")
 
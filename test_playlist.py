@@ -11,7 +11,6 @@ import os
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.player.mpv_controller import MpvController
 import time
 
 def test_playlist():
@@ -24,6 +23,9 @@ def test_playlist():
         print(f"错误: 视频目录不存在: {video_path}")
         return
     
+    # 播放器模块在确认需要时才导入
+    from src.player.mpv_controller import MpvController
+    
     print(f"测试播放列表功能")
     print(f"视频目录: {video_path}")
     